@@ -0,0 +1,43 @@
+# castle/ai_scheduler.py
+
+# Most agents that run their expensive AI work (retargeting, re-rotating) in one tick
+AI_BUDGET = 8
+
+
+class AIScheduler:
+    def __init__(self, budget=AI_BUDGET):
+        """
+        Initializes the AIScheduler.
+
+        Spreads the expensive part of every agent's update across ticks: each tick
+        only the next budget agents, taking turns, have their think() called. The
+        cost per tick stays bounded however many agents there are, and with n agents
+        each one thinks at least every ceil(n / budget) ticks. The budget counts
+        agents rather than time so that runs stay reproducible.
+        Args:
+            budget (int): Most think() calls per tick.
+        """
+        self.budget = budget
+        self.cursor = 0  # Position in the agent list of the next agent to think
+        self.thinks = 0  # Total think() calls, for profiling
+
+    def run(self, agents):
+        """
+        Lets the next agents in turn think.
+        Args:
+            agents (EntityStore): The agents, each with a think() method.
+        """
+        count = len(agents)
+        if not count:
+            self.cursor = 0
+            return
+        turns = min(self.budget, count)
+        # Removals move agents to other positions, so an agent may occasionally miss or repeat a turn
+        cursor = self.cursor % count
+        for _ in range(turns):
+            agents[cursor].think()
+            cursor += 1
+            if cursor == count:
+                cursor = 0
+        self.cursor = cursor
+        self.thinks += turns
@@ -0,0 +1,107 @@
+# castle/assets.py
+import math
+
+import pygame
+
+# Image name -> file, for every piece of art the game uses
+IMAGE_FILES = {
+    'archer': 'pics/archer.png',
+    'arrow': 'pics/arrow.png',
+    'arrow1': 'pics/arrow1.png',
+    'arrow_stack': 'pics/arrow_stack.png',
+    'background': 'pics/background.png',
+    'bear': 'pics/bear.png',
+    'bolt': 'pics/bolt.png',
+    'castle': 'pics/castle.png',
+    'double_damage': 'pics/double_damage.png',
+    'health': 'pics/health.png',
+    'invincibility': 'pics/invincibility.png',
+    'laser': 'pics/laser.png',
+    'mana': 'pics/mana.png',
+    'menu': 'pics/menu.png',
+    'mushroom': 'pics/mushroom.png',
+    'orb': 'pics/orb.png',
+    'rapid_fire': 'pics/rapid_fire.png',
+    'wall': 'pics/wall.png',
+    'wizard': 'pics/wizard.png',
+}
+# Images without transparency, converted with convert() instead of convert_alpha()
+OPAQUE_IMAGES = {'background'}
+# Rarely used art that is only loaded the first time it is asked for
+LAZY_IMAGES = {'bear', 'mana'}
+
+
+def scaled_size(size, scale):
+    """
+    Returns a size scaled by (scale_x, scale_y), rounded up so scaled tiles leave no gaps.
+    Args:
+        size (tuple): The width and height.
+        scale (tuple): The x and y scale, or None to leave the size as it is.
+    Returns:
+        tuple: The scaled width and height, at least 1 pixel each.
+    """
+    if scale is None:
+        return size
+    return (max(math.ceil(size[0] * scale[0] - 1e-9), 1), max(math.ceil(size[1] * scale[1] - 1e-9), 1))
+
+
+def scale_image(image, scale):
+    """
+    Returns a copy of an image scaled by (scale_x, scale_y).
+    Args:
+        image (pygame.Surface): The image.
+        scale (tuple): The x and y scale.
+    Returns:
+        pygame.Surface: The scaled copy.
+    """
+    size = scaled_size(image.get_size(), scale)
+    # smoothscale only handles 24 and 32 bit surfaces
+    if image.get_bitsize() >= 24:
+        return pygame.transform.smoothscale(image, size)
+    return pygame.transform.scale(image, size)
+
+
+class AssetManager:
+    def __init__(self, image_files=IMAGE_FILES):
+        """
+        Initializes the AssetManager.
+
+        Every image is decoded once and the same Surface is handed to every user.
+        Args:
+            image_files (dict): Image name -> file path.
+        """
+        self.image_files = image_files
+        self.images = {}
+
+    def load(self):
+        """
+        Loads every image that is not lazy. Call this after pygame.display.set_mode
+        so the images can be converted to the display format.
+        """
+        for name in self.image_files:
+            if name not in LAZY_IMAGES:
+                self.image(name)
+
+    def image(self, name, scale=None):
+        """
+        Returns an image, loading it on first use.
+        Args:
+            name (str): The image name.
+            scale (tuple): The x and y scale to pre-scale it by, once, or None for its own size.
+        Returns:
+            pygame.Surface: The shared image.
+        """
+        if scale is not None:
+            key = (name, scale)
+            image = self.images.get(key)
+            if image is None:
+                image = self.images[key] = scale_image(self.image(name), scale)
+            return image
+        image = self.images.get(name)
+        if image is None:
+            image = pygame.image.load(self.image_files[name])
+            # Without a display there is no format to convert to
+            if pygame.display.get_surface() is not None:
+                image = image.convert() if name in OPAQUE_IMAGES else image.convert_alpha()
+            self.images[name] = image
+        return image
@@ -0,0 +1,97 @@
+# castle/background.py
+import math
+from collections import OrderedDict
+
+import pygame
+
+# Size in world pixels of one pre-scaled background chunk
+BACKGROUND_CHUNK_SIZE = 256
+
+
+class Background:
+    def __init__(self, tile_img, playable_area_size, screen_width, screen_height, chunk_size=BACKGROUND_CHUNK_SIZE,
+                 scale=None):
+        """
+        Initializes the Background.
+
+        Only the source tile is kept around. The tile is stretched over the whole
+        playable area, but the stretched image is never built: the area under the
+        camera is composed from small pre-scaled chunks held in a bounded cache.
+        Args:
+            tile_img (pygame.Surface): The source background image.
+            playable_area_size (int): The size of the playable area.
+            screen_width (int): The width of the area the background is drawn into.
+            screen_height (int): The height of the area the background is drawn into.
+            chunk_size (int): The size of a cached chunk in pixels of the surface drawn into.
+            scale (tuple): Pixels of the surface drawn into per world pixel along x and y, or None for 1.
+        """
+        self.tile_img = tile_img
+        self.playable_area_size = playable_area_size
+        self.chunk_size = chunk_size
+        self.world_scale_x, self.world_scale_y = scale or (1, 1)
+        # The playable area as it appears on the surface drawn into
+        self.area_width = round(playable_area_size * self.world_scale_x)
+        self.area_height = round(playable_area_size * self.world_scale_y)
+        self.scale_x = self.area_width / tile_img.get_width()
+        self.scale_y = self.area_height / tile_img.get_height()
+        # Enough chunks to cover the view twice over, whatever the world size
+        columns = math.ceil(screen_width / chunk_size) + 1
+        rows = math.ceil(screen_height / chunk_size) + 1
+        self.cache_size = columns * rows * 2
+        self.chunks = OrderedDict()
+
+    def get_chunk(self, chunk_x, chunk_y):
+        """
+        Returns a pre-scaled chunk, building it on a cache miss.
+        Args:
+            chunk_x (int): The chunk column.
+            chunk_y (int): The chunk row.
+        Returns:
+            pygame.Surface: The chunk, at most chunk_size pixels square.
+        """
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        x0 = chunk_x * self.chunk_size
+        y0 = chunk_y * self.chunk_size
+        x1 = min(x0 + self.chunk_size, self.area_width)
+        y1 = min(y0 + self.chunk_size, self.area_height)
+        # Source pixels that map onto this chunk, rounded outwards
+        src_x0 = int(x0 / self.scale_x)
+        src_y0 = int(y0 / self.scale_y)
+        src_x1 = min(math.ceil(x1 / self.scale_x), self.tile_img.get_width())
+        src_y1 = min(math.ceil(y1 / self.scale_y), self.tile_img.get_height())
+        source = self.tile_img.subsurface((src_x0, src_y0, src_x1 - src_x0, src_y1 - src_y0))
+        scaled = pygame.transform.scale(source, (math.ceil((src_x1 - src_x0) * self.scale_x),
+                                                 math.ceil((src_y1 - src_y0) * self.scale_y)))
+        area = pygame.Rect(int(x0 - src_x0 * self.scale_x), int(y0 - src_y0 * self.scale_y), x1 - x0, y1 - y0)
+        # Keep only the chunk itself, so the cache size does not grow with the scale factor
+        chunk = scaled.subsurface(area.clip(scaled.get_rect())).copy()
+
+        self.chunks[key] = chunk
+        if len(self.chunks) > self.cache_size:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def draw(self, screen, offset_x, offset_y):
+        """
+        Draws the part of the background that lies under the camera.
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            offset_x (int): The x offset for drawing, in world pixels.
+            offset_y (int): The y offset for drawing, in world pixels.
+        """
+        width, height = screen.get_size()
+        offset_x *= self.world_scale_x
+        offset_y *= self.world_scale_y
+        first_x = max(int(offset_x) // self.chunk_size, 0)
+        first_y = max(int(offset_y) // self.chunk_size, 0)
+        last_x = min(int(offset_x + width) // self.chunk_size, (self.area_width - 1) // self.chunk_size)
+        last_y = min(int(offset_y + height) // self.chunk_size, (self.area_height - 1) // self.chunk_size)
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                chunk = self.get_chunk(chunk_x, chunk_y)
+                screen.blit(chunk, (chunk_x * self.chunk_size - offset_x, chunk_y * self.chunk_size - offset_y))
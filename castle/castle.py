@@ -1,17 +1,18 @@
 # castle/castle.py
 import pygame
-import random
 import math
 
 class Castle:
-    def __init__(self, playable_area_size, castle_size):
+    def __init__(self, playable_area_size, castle_size, context):
         """
         Initializes the Castle.
         
         Args:
             playable_area_size (int): The size of the playable area.
             castle_size (tuple): The size of the castle.
+            context (GameContext): The source of random numbers.
         """
+        self.random = context.random
         self.playable_area_size = playable_area_size
         self.size = castle_size
         self.max_health = 25
@@ -27,8 +28,8 @@ class Castle:
         """
         # Generate a random position for the castle can not be placed over the player
         margin = 10
-        x = random.randint(margin, self.playable_area_size - self.size[0] - margin)
-        y = random.randint(margin, self.playable_area_size - self.size[1] - margin)
+        x = self.random.randint(margin, self.playable_area_size - self.size[0] - margin)
+        y = self.random.randint(margin, self.playable_area_size - self.size[1] - margin)
         return [x, y]
     #check player position
     def generate_random_position(self):
@@ -38,8 +39,8 @@ class Castle:
         Returns:
             list: A list containing the x and y coordinates.
         """
-        x = random.randint(0, self.playable_area_size - self.size[0])
-        y = random.randint(0, self.playable_area_size - self.size[1])
+        x = self.random.randint(0, self.playable_area_size - self.size[0])
+        y = self.random.randint(0, self.playable_area_size - self.size[1])
             #if position is over player, generate new position
         if x > 400 and x < 600 and y > 400 and y < 600:
             return self.generate_random_position()
@@ -86,17 +87,17 @@ class Castle:
         """
         item_offset_range = 50  # The range within which items will be spread out
         for _ in range(4):  # Drop two 'arrow_stack' items
-            offset_x = random.randint(-item_offset_range, item_offset_range)
-            offset_y = random.randint(-item_offset_range, item_offset_range)
+            offset_x = self.random.randint(-item_offset_range, item_offset_range)
+            offset_y = self.random.randint(-item_offset_range, item_offset_range)
             item_position = [self.position[0] + offset_x, self.position[1] + offset_y]
-            stardust_manager.star_dust_list.append(stardust_manager.create_star_dust(position=item_position, type='arrow_stack'))
+            stardust_manager.add_star_dust(stardust_manager.create_star_dust(position=item_position, type=stardust_manager.arrow_stack_type))
             
         # Optionally, other items can be added below:
         # Make sure they don't fall into exactly the same spot
-        health_item_offset_x = random.randint(-item_offset_range, item_offset_range)
-        health_item_offset_y = random.randint(-item_offset_range, item_offset_range)
+        health_item_offset_x = self.random.randint(-item_offset_range, item_offset_range)
+        health_item_offset_y = self.random.randint(-item_offset_range, item_offset_range)
         health_item_position = [self.position[0] + health_item_offset_x, self.position[1] + health_item_offset_y]
-        stardust_manager.star_dust_list.append(stardust_manager.create_star_dust(position=health_item_position, type='health'))
+        stardust_manager.add_star_dust(stardust_manager.create_star_dust(position=health_item_position, type=stardust_manager.health_type))
 
     def reset(self):
         """
@@ -0,0 +1,52 @@
+# castle/context.py
+import random
+
+
+class SimulatedClock:
+    def __init__(self, rate):
+        """
+        Initializes the SimulatedClock.
+
+        Game time that only moves when the simulation steps, by exactly one tick
+        per step, so runs do not depend on how fast the machine is.
+        Args:
+            rate (int): Ticks per second.
+        """
+        self.step_ms = 1000 / rate
+        self.ticks = 0
+
+    def __call__(self):
+        """
+        Returns the time in milliseconds.
+        """
+        return int(self.ticks * self.step_ms)
+
+    def advance(self):
+        """
+        Moves the clock on by one tick.
+        """
+        self.ticks += 1
+
+
+class GameContext:
+    def __init__(self, clock, seed=None):
+        """
+        Initializes the GameContext.
+
+        Everything in the game that reads the time or draws a random number gets
+        it from here rather than from pygame or the global random module, so two
+        runs with the same clock, seed and input play out identically.
+        Args:
+            clock (SimulatedClock): The game clock; anything callable that returns
+                milliseconds and has advance().
+            seed (int): The seed for the random numbers, or None for a random seed.
+        """
+        self.clock = clock
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    def now(self):
+        """
+        Returns the game time in milliseconds.
+        """
+        return self.clock()
@@ -0,0 +1,84 @@
+# castle/entity_store.py
+
+
+class EntityStore:
+    def __init__(self):
+        """
+        Initializes the EntityStore.
+
+        A list of entities that also knows where each entity sits in it, so a single
+        entity is removed in constant time by moving the last one into its slot.
+        The entities themselves are the handles; their order is not kept.
+        """
+        self.items = []
+        self.index = {}  # id(item) -> position in items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, position):
+        """
+        Returns the entity at a position. Positions are dense, from 0 to len - 1, but
+        remove() moves the last entity into the removed one's place and remove_if()
+        closes up the gaps it leaves, so an entity's position can change.
+        Args:
+            position (int): The position.
+        Returns:
+            The entity.
+        """
+        return self.items[position]
+
+    def __contains__(self, item):
+        return id(item) in self.index
+
+    def add(self, item):
+        """
+        Adds an entity.
+        Args:
+            item: The entity to add.
+        """
+        self.index[id(item)] = len(self.items)
+        self.items.append(item)
+
+    def remove(self, item):
+        """
+        Removes an entity by swapping the last entity into its place. Do not call
+        this while iterating over the store; collect the entities first or use remove_if.
+        Args:
+            item: The entity to remove.
+        """
+        position = self.index.pop(id(item))
+        last = self.items.pop()
+        if last is not item:
+            self.items[position] = last
+            self.index[id(last)] = position
+
+    def remove_if(self, predicate):
+        """
+        Removes every entity matching a predicate in a single pass.
+        Args:
+            predicate (callable): Returns True for the entities to remove.
+        Returns:
+            list: The removed entities.
+        """
+        removed = []
+        kept = []
+        for item in self.items:
+            if predicate(item):
+                removed.append(item)
+            else:
+                kept.append(item)
+        if removed:
+            self.items = kept
+            self.index = {id(item): position for position, item in enumerate(kept)}
+        return removed
+
+    def clear(self):
+        """
+        Removes every entity.
+        """
+        self.items = []
+        self.index = {}
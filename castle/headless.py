@@ -0,0 +1,95 @@
+# castle/headless.py
+import argparse
+import random
+import time
+import pygame
+from assets import AssetManager
+from rotation_cache import RotationCache
+from pickups import PickupRegistry
+from simulation import Simulation, SIMULATION_RATE
+from context import GameContext, SimulatedClock
+from main import PLAYABLE_AREA_SIZE
+
+# How many ticks the scripted player holds one direction before picking another
+INPUT_HOLD_TICKS = 30
+
+
+class ScriptedKeys:
+    def __init__(self, seed):
+        """
+        Initializes the ScriptedKeys.
+
+        Stands in for pygame.key.get_pressed(): the player holds the fire button
+        and wanders in a random direction, changing it every INPUT_HOLD_TICKS ticks.
+        Args:
+            seed (int): The seed for the random directions.
+        """
+        self.random = random.Random(seed)
+        self.pressed = set()
+        self.ticks = 0
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    def advance(self):
+        """
+        Moves the script on by one tick.
+        """
+        if self.ticks % INPUT_HOLD_TICKS == 0:
+            direction = self.random.choice([pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN])
+            self.pressed = {direction, pygame.K_SPACE}
+        self.ticks += 1
+
+
+def run(ticks, seed=0, report_every=0):
+    """
+    Runs the game logic without a window or a frame cap. The game restarts whenever the player dies.
+    Runs with the same ticks and seed play out identically.
+    Args:
+        ticks (int): The number of simulation ticks to run.
+        seed (int): The seed for the scripted input and the game's random numbers.
+        report_every (int): Print the rate every this many ticks, or 0 to stay quiet.
+    Returns:
+        dict: The ticks run, the wall time they took, the ticks per second, the number of deaths,
+            and the final player level and position for comparing runs.
+    """
+    assets = AssetManager()
+    assets.load()
+    castle_size = assets.image('castle').get_size()
+    context = GameContext(SimulatedClock(SIMULATION_RATE), seed)
+    simulation = Simulation(PLAYABLE_AREA_SIZE, castle_size, assets, RotationCache(), PickupRegistry(),
+                            context=context)
+    simulation.reset()
+    keys = ScriptedKeys(seed)
+    deaths = 0
+
+    start = time.perf_counter()
+    for tick in range(1, ticks + 1):
+        keys.advance()
+        simulation.step(keys)
+        if simulation.game_over:
+            deaths += 1
+            simulation.reset()
+        if report_every and tick % report_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f'{tick} ticks, {tick / elapsed:.0f} ticks/s')
+    elapsed = time.perf_counter() - start
+    return {'ticks': ticks, 'seconds': elapsed, 'ticks_per_second': ticks / elapsed, 'deaths': deaths,
+            'level': simulation.player.current_level, 'position': tuple(simulation.player.position)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the game logic headless, as fast as possible.')
+    parser.add_argument('--ticks', type=int, default=SIMULATION_RATE * 600, help='simulation ticks to run')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the scripted input and the game')
+    parser.add_argument('--report-every', type=int, default=SIMULATION_RATE * 60,
+                        help='print the rate every this many ticks, 0 to only print the total')
+    args = parser.parse_args()
+    result = run(args.ticks, args.seed, args.report_every)
+    game_seconds = result['ticks'] / SIMULATION_RATE
+    print(f"{result['ticks']} ticks in {result['seconds']:.2f}s: {result['ticks_per_second']:.0f} ticks/s, "
+          f"{game_seconds / result['seconds']:.1f}x real time, {result['deaths']} deaths")
+
+
+if __name__ == "__main__":
+    main()
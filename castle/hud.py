@@ -0,0 +1,68 @@
+# castle/hud.py
+import pygame
+
+
+class HudElement(pygame.sprite.DirtySprite):
+    def __init__(self, render, topleft):
+        """
+        Initializes a HUD element.
+
+        The element's image is only rebuilt when its value changes, and only then
+        is it flagged dirty.
+        Args:
+            render (callable): Builds the element's image from its value.
+            topleft (tuple): The screen position of the element.
+        """
+        super().__init__()
+        self.render = render
+        self.topleft = topleft
+        self.value = None
+        self.image = pygame.Surface((0, 0))
+        self.rect = self.image.get_rect(topleft=topleft)
+        self.visible = 0
+
+    def set_value(self, value):
+        """
+        Updates the value shown by the element. None hides the element.
+        Args:
+            value: Anything comparable that the render callable accepts.
+        """
+        if value == self.value:
+            return
+        self.value = value
+        if value is None:
+            self.visible = 0
+        else:
+            self.image = self.render(value)
+            self.rect = self.image.get_rect(topleft=self.topleft)
+            self.visible = 1
+        self.dirty = 1
+
+
+class Hud(pygame.sprite.LayeredDirty):
+    def __init__(self, dirty_rects):
+        """
+        Initializes the HUD group.
+        Args:
+            dirty_rects (bool): Whether to draw only the changed areas, or every element every frame.
+        """
+        # Never let the group fall back to the other drawing mode on its own
+        super().__init__(_use_update=dirty_rects, _time_threshold=float('inf') if dirty_rects else -1)
+
+    def repaint_rects(self, rects):
+        """
+        Marks areas to repaint. Overlapping areas are merged first, since a sprite
+        drawn once per overlapping area would be blended onto itself.
+        Args:
+            rects (list): The screen areas to repaint.
+        """
+        merged = []
+        for rect in rects:
+            rect = pygame.Rect(rect)
+            index = rect.collidelist(merged)
+            while index > -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        for rect in merged:
+            self.repaint_rect(rect)
@@ -1,77 +1,33 @@
 # castle/main.py
 import pygame
 import sys
-import random
-import math
-from player import Player
-from stardust import StarDustManager
+import time
 from render import Renderer
-from utils import gain_experience, reset_game
-from wizard_manager import WizardManager
-from castle import Castle
+from assets import AssetManager
+from rotation_cache import RotationCache
+from text import TextRenderer
+from pickups import PickupRegistry
+from simulation import Simulation, SimulationThread, SIMULATION_RATE
+from snapshot import SnapshotBuffer, WorldSnapshot
 
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 800
 PLAYABLE_AREA_SIZE = 5000
-
-castle_damage_multiplier = 1.0
-
-def handle_castle_laser_collision(player, castle, stardust_manager, castle_lasers):
-    global castle_damage_multiplier
-    for laser in player.lasers[:]:
-        laser_rect = pygame.Rect(laser['pos'][0], laser['pos'][1], 5, 5)
-        adjusted_castle_hitbox = pygame.Rect(castle.position[0], castle.position[1], castle.size[0], castle.size[1])
-        if adjusted_castle_hitbox.colliderect(laser_rect):
-            castle.take_damage(2)
-            player.lasers.remove(laser)
-            direction_vector = (player.position[0] - castle.position[0], player.position[1] - castle.position[1])
-            distance = math.sqrt(direction_vector[0]**2 + direction_vector[1]**2)
-            normalized_direction = (direction_vector[0] / distance, direction_vector[1] / distance)
-            castle_lasers.append({'pos': list(castle.position), 'dir': normalized_direction})
-        if castle.health <= 0:
-            gain_experience(player, 10)
-            castle.drop_items(stardust_manager)
-            castle.reset()
-            castle_damage_multiplier += 0.1
-
-def handle_castle_laser_movement(castle_lasers, player):
-    global castle_damage_multiplier
-    for laser in castle_lasers[:]:
-        laser['pos'][0] += laser['dir'][0] * 10
-        laser['pos'][1] += laser['dir'][1] * 10
-        laser_rect = pygame.Rect(laser['pos'][0], laser['pos'][1], 5, 5)
-        player_rect = pygame.Rect(player.position[0] - player.size, player.position[1] - player.size, player.size * 2, player.size * 2)
-        if player_rect.colliderect(laser_rect):
-            player.take_damage(2 * castle_damage_multiplier)
-            castle_lasers.remove(laser)
-
-def handle_wizard_orb_collision(player, wizard_manager):
-    for wizard in wizard_manager.wizards:
-        for orb in wizard.orbs[:]:
-            orb_rect = pygame.Rect(orb['pos'][0], orb['pos'][1], wizard.orb_image.get_width(), wizard.orb_image.get_height())
-            player_rect = pygame.Rect(player.position[0] - player.size, player.position[1] - player.size, player.size * 2, player.size * 2)
-            if player_rect.colliderect(orb_rect):
-                player.take_damage(5)
-                wizard.orbs.remove(orb)
-
-def handle_player_laser_collision_with_wizard(player, wizard_manager):
-    for wizard in wizard_manager.wizards:
-        for laser in player.lasers[:]:
-            laser_rect = pygame.Rect(laser['pos'][0], laser['pos'][1], 5, 5)
-            wizard_hitbox = pygame.Rect(wizard.position[0] - wizard.size, wizard.position[1] - wizard.size, wizard.size * 2, wizard.size * 2)
-            if wizard_hitbox.colliderect(laser_rect):
-                wizard.take_damage(5)
-                player.lasers.remove(laser)
-            if wizard.health <= 0:
-                gain_experience(player, 5)
-                wizard_manager.handle_collisions(player)
-
-def draw_game_over(screen):
-    font_large = pygame.font.Font(None, 74)
-    font_small = pygame.font.Font(None, 50)
-    loser_text = font_large.render('LOSER', True, (255, 0, 0))
-    restart_text = font_small.render('Press (R) to Restart', True, (255, 255, 255))
-    quit_text = font_small.render('Press (Q) to Quit', True, (255, 255, 255))
+# Push only the changed parts of the screen to the display instead of flipping it whole
+DIRTY_RECT_RENDERING = False
+# Render the world at this size and scale it up to the window, e.g. (500, 400) for half the detail with the
+# same view; None renders at window size
+INTERNAL_RESOLUTION = None
+# Most frames drawn per second, independent of SIMULATION_RATE; 0 draws as fast as possible
+FRAME_RATE = 144
+# Most simulation ticks run before a frame is drawn; past this the game slows down instead of stalling
+MAX_CATCH_UP_STEPS = 5
+# Run the simulation on a worker thread and draw from the snapshots it publishes
+THREADED_SIMULATION = False
+
+def draw_game_over(screen, text_renderer):
+    loser_text = text_renderer.render('LOSER', 74, (255, 0, 0))
+    restart_text = text_renderer.render('Press (R) to Restart', 50, (255, 255, 255))
     screen.blit(loser_text, (SCREEN_WIDTH // 2 - loser_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
     screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2))
 
@@ -79,46 +35,46 @@ def main():
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption('Castle Defense')
-    star_img = pygame.image.load('pics/archer.png')
-    background_img = pygame.image.load('pics/background.png')
-    background_img = pygame.transform.scale(background_img, (PLAYABLE_AREA_SIZE, PLAYABLE_AREA_SIZE))
-    boost_img = pygame.image.load('pics/bolt.png')
-    arrow1_img = pygame.image.load('pics/arrow1.png')
-    castle_img = pygame.image.load('pics/castle.png')
-    arrow_img = pygame.image.load('pics/arrow.png')
-    health_img = pygame.image.load('pics/health.png')
-    arrow_stack_img = pygame.image.load('pics/arrow_stack.png')
-    mushroom_img = pygame.image.load('pics/mushroom.png')
-    wall_img = pygame.image.load('pics/wall.png')
-    bear_img = pygame.image.load('pics/bear.png')
-    laser_img = pygame.image.load('pics/laser.png')
-    invincibility_img = pygame.image.load('pics/invincibility.png')
-    double_damage_img = pygame.image.load('pics/double_damage.png')
-    rapid_fire_img = pygame.image.load('pics/rapid_fire.png')
-    menu_img = pygame.image.load('pics/menu.png')
+    assets = AssetManager()
+    assets.load()
+    castle_img = assets.image('castle')
 
     castle_rect = castle_img.get_rect()
     CASTLE_SIZE = castle_rect.size
     
-    player = Player(playable_area_size=PLAYABLE_AREA_SIZE)
-    stardust_manager = StarDustManager(playable_area_size=PLAYABLE_AREA_SIZE, castle_size=CASTLE_SIZE)
-    renderer = Renderer(
-        screen, background_img, star_img, boost_img, arrow1_img, castle_img,
-        health_img, arrow_img, arrow_stack_img, mushroom_img, wall_img, laser_img,
-        invincibility_img, double_damage_img, rapid_fire_img, menu_img,
-        SCREEN_WIDTH, SCREEN_HEIGHT, PLAYABLE_AREA_SIZE
-    )
-    wizard_manager = WizardManager(PLAYABLE_AREA_SIZE, player, stardust_manager)
-    castle = Castle(playable_area_size=PLAYABLE_AREA_SIZE, castle_size=CASTLE_SIZE)
-    castle_lasers = []
+    rotation_cache = RotationCache()
+    rotation_cache.prewarm(assets.image('laser'))
+    rotation_cache.prewarm(assets.image('arrow'))
+    rotation_cache.prewarm(assets.image('wizard'))
+    text_renderer = TextRenderer()
+
+    pickups = PickupRegistry()
+    # Rotation caches are not shared between threads, so a simulation thread gets its own
+    simulation_rotation_cache = RotationCache() if THREADED_SIMULATION else rotation_cache
+    simulation = Simulation(PLAYABLE_AREA_SIZE, CASTLE_SIZE, assets, simulation_rotation_cache, pickups,
+                            rate=SIMULATION_RATE)
+    renderer = Renderer(screen, assets, SCREEN_WIDTH, SCREEN_HEIGHT, PLAYABLE_AREA_SIZE, rotation_cache, text_renderer,
+                        pickups, dirty_rects=DIRTY_RECT_RENDERING, internal_resolution=INTERNAL_RESOLUTION)
 
     clock = pygame.time.Clock()
     running = True
     paused = False
     game_over = False
-
-    reset_game(player, stardust_manager)
-    wizard_manager.reset()
+    accumulator = 0.0  # Real time not yet simulated, in milliseconds
+
+    simulation.reset()
+    simulation_thread = None
+    if THREADED_SIMULATION:
+        snapshots = SnapshotBuffer()
+        snapshots.publish(WorldSnapshot(simulation))
+        simulation_thread = SimulationThread(simulation, snapshots, MAX_CATCH_UP_STEPS)
+        simulation_thread.start()
+
+    def restart(reset_castle=False):
+        if simulation_thread is None:
+            simulation.reset(reset_castle)
+        else:
+            simulation_thread.reset(reset_castle)
 
     while running:
         for event in pygame.event.get():
@@ -127,17 +83,14 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if game_over:
                     if event.key == pygame.K_r:
-                        reset_game(player, stardust_manager)
-                        wizard_manager.reset()
+                        restart()
                         game_over = False
                 else:
                     if event.key == pygame.K_p:
                         paused = not paused
                     elif paused and event.key == pygame.K_r:
-                        reset_game(player, stardust_manager)
+                        restart(reset_castle=True)
                         paused = False
-                        wizard_manager.reset()
-                        castle.reset()
                     elif paused and event.key == pygame.K_q:
                         # Quit the game
                         pygame.quit()
@@ -147,46 +100,51 @@ def main():
                 if renderer.menu_button_rect.collidepoint(mouse_pos):
                     paused = not paused
 
+        frame_time = clock.tick(FRAME_RATE)
         if not paused and not game_over:
-            keys = pygame.key.get_pressed()
-            player.handle_movement(keys, castle.position, CASTLE_SIZE)
-            player.check_collisions(stardust_manager)
-            player.handle_laser_movement(stardust_manager)
-            player.update_status()
-            player.handle_shooting(keys)  # Handle shooting when spacebar is held down
-            stardust_manager.spawn_star_dust()
-            wizard_manager.update(castle.position, CASTLE_SIZE)
-            handle_castle_laser_collision(player, castle, stardust_manager, castle_lasers)
-            handle_castle_laser_movement(castle_lasers, player)
-            handle_wizard_orb_collision(player, wizard_manager)
-            handle_player_laser_collision_with_wizard(player, wizard_manager)
-            
-            if not paused and player.health <= 0:
-                game_over = True            
-            screen.fill((0, 0, 0))
+            if simulation_thread is None:
+                # Run as many fixed ticks as the real time since the last frame covers
+                accumulator += frame_time
+                keys = pygame.key.get_pressed()
+                steps = 0
+                while accumulator >= simulation.step_ms and steps < MAX_CATCH_UP_STEPS:
+                    simulation.step(keys)
+                    accumulator -= simulation.step_ms
+                    steps += 1
+                    if simulation.game_over:
+                        game_over = True
+                        break
+                if steps == MAX_CATCH_UP_STEPS:
+                    # Too far behind to catch up; drop the backlog rather than fall further behind
+                    accumulator = min(accumulator, simulation.step_ms)
+                world = simulation
+                alpha = accumulator / simulation.step_ms
+            else:
+                simulation_thread.keys = pygame.key.get_pressed()
+                simulation_thread.paused = False
+                world, published_at = snapshots.latest()
+                game_over = world.game_over
+                alpha = min((time.perf_counter() - published_at) * 1000 / simulation.step_ms, 1.0)
 
             if not game_over:
-                renderer.draw_scene(player, stardust_manager, castle.position, castle.health, wizard_manager)
-                renderer.draw_castle_lasers(castle_lasers, player.position[0] - SCREEN_WIDTH // 2, player.position[1] - SCREEN_HEIGHT // 2)
-                castle.draw_castle(screen, castle_img, player.position[0] - SCREEN_WIDTH // 2, player.position[1] - SCREEN_HEIGHT // 2)
-                renderer.draw_menu_button()
-                wizard_manager.draw(screen, player.position[0] - SCREEN_WIDTH // 2, player.position[1] - SCREEN_HEIGHT // 2)
-            # Draw game over screen
-            if game_over:
-                draw_game_over(screen)
-                
-            elif paused:
-                renderer.draw_menu()
+                # Draw the world between the last two ticks, by how far we are into the next one
+                renderer.draw_scene(world, alpha)
+                renderer.present()
+            else:
+                # Draw game over screen
+                screen.fill((0, 0, 0))
+                draw_game_over(screen, text_renderer)
+                renderer.invalidate()
+                pygame.display.flip()
 
         elif paused:
+            if simulation_thread is not None:
+                simulation_thread.paused = True
             renderer.draw_menu()
             pygame.display.flip()
-            clock.tick(60)
-            continue
-
-        pygame.display.flip()
-        clock.tick(60)
 
+    if simulation_thread is not None:
+        simulation_thread.stop()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,146 @@
+# castle/minimap.py
+import pygame
+
+# How many times per second the mini-map is redrawn
+MINIMAP_REFRESH_RATE = 10
+# Above this many items or projectiles, they are shown as a density map instead of dots
+MINIMAP_DOT_LIMIT = 200
+# Size in mini-map pixels of one density map cell
+MINIMAP_DENSITY_CELL = 4
+
+
+class Minimap:
+    def __init__(self, width, height, playable_area_size, refresh_rate=MINIMAP_REFRESH_RATE,
+                 show_items=False, show_projectiles=False):
+        """
+        Initializes the Minimap.
+
+        The mini-map is an off-screen surface redrawn at its own, lower rate. Its
+        background is cached and markers are blitted from pre-rendered dots.
+        Args:
+            width (int): The width of the mini-map.
+            height (int): The height of the mini-map.
+            playable_area_size (int): The size of the playable area.
+            refresh_rate (float): How many times per second the mini-map is redrawn.
+            show_items (bool): Whether to show stardust.
+            show_projectiles (bool): Whether to show lasers and orbs.
+        """
+        self.width = width
+        self.height = height
+        self.scale_x = width / playable_area_size
+        self.scale_y = height / playable_area_size
+        self.refresh_interval = 1000 / refresh_rate
+        self.show_items = show_items
+        self.show_projectiles = show_projectiles
+        self.surface = pygame.Surface((width, height))
+        self.background = pygame.Surface((width, height))
+        self.background.fill((50, 50, 50))
+        self.player_dot = self.make_dot((0, 255, 0), 5)
+        self.castle_dot = self.make_dot((255, 0, 0), 5)
+        self.wizard_dot = self.make_dot((0, 0, 255), 5)  # Blue for wizard
+        self.item_dot = self.make_dot((255, 255, 0), 1)
+        self.projectile_dot = self.make_dot((255, 255, 255), 1)
+        self.next_refresh = 0
+        self.markers = None
+        self.version = 0
+
+    @staticmethod
+    def make_dot(colour, radius):
+        """
+        Renders a round marker.
+        Args:
+            colour (tuple): The marker colour.
+            radius (int): The marker radius.
+        Returns:
+            pygame.Surface: The marker.
+        """
+        dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(dot, colour, (radius, radius), radius)
+        return dot
+
+    def update(self, now, player_pos, castle_pos, wizard_positions, item_positions=(), projectile_positions=()):
+        """
+        Redraws the mini-map if it is due. The version is bumped whenever the surface changes.
+        Args:
+            now (int): The current time in milliseconds.
+            player_pos (tuple): The position of the player.
+            castle_pos (tuple): The position of the castle.
+            wizard_positions (list): The positions of the wizards.
+            item_positions (list): The positions of the stardust, if shown.
+            projectile_positions (list): The positions of the projectiles, if shown.
+        """
+        if now < self.next_refresh:
+            return
+        self.next_refresh = now + self.refresh_interval
+        markers = (self.to_minimap(player_pos), self.to_minimap(castle_pos),
+                   tuple(self.to_minimap(position) for position in wizard_positions))
+        # Markers are only redrawn when one moves by a whole pixel
+        if markers == self.markers and not item_positions and not projectile_positions:
+            return
+        self.markers = markers
+
+        self.surface.blit(self.background, (0, 0))
+        if item_positions:
+            self.draw_points(item_positions, self.item_dot, (255, 255, 0))
+        if projectile_positions:
+            self.draw_points(projectile_positions, self.projectile_dot, (255, 255, 255))
+        player_marker, castle_marker, wizard_markers = markers
+        self.surface.blits([(self.wizard_dot, self.centre(self.wizard_dot, marker)) for marker in wizard_markers],
+                           doreturn=False)
+        self.surface.blit(self.castle_dot, self.centre(self.castle_dot, castle_marker))
+        self.surface.blit(self.player_dot, self.centre(self.player_dot, player_marker))
+        self.version += 1
+
+    def to_minimap(self, position):
+        """
+        Converts a world position to mini-map pixels.
+        Args:
+            position (tuple): The world position.
+        Returns:
+            tuple: The mini-map position.
+        """
+        return int(position[0] * self.scale_x), int(position[1] * self.scale_y)
+
+    @staticmethod
+    def centre(dot, marker):
+        """
+        Returns where to blit a dot so it is centred on a marker.
+        Args:
+            dot (pygame.Surface): The dot.
+            marker (tuple): The mini-map position.
+        Returns:
+            tuple: The top left corner for the dot.
+        """
+        return marker[0] - dot.get_width() // 2, marker[1] - dot.get_height() // 2
+
+    def draw_points(self, positions, dot, colour):
+        """
+        Draws many positions, as dots when there are few and as a density map otherwise.
+        Args:
+            positions (list): The world positions.
+            dot (pygame.Surface): The dot used when there are few positions.
+            colour (tuple): The density map colour.
+        """
+        if len(positions) <= MINIMAP_DOT_LIMIT:
+            self.surface.blits([(dot, self.centre(dot, self.to_minimap(position))) for position in positions],
+                               doreturn=False)
+            return
+        columns = self.width // MINIMAP_DENSITY_CELL
+        rows = self.height // MINIMAP_DENSITY_CELL
+        counts = bytearray(columns * rows)
+        cell_x = self.scale_x / MINIMAP_DENSITY_CELL
+        cell_y = self.scale_y / MINIMAP_DENSITY_CELL
+        for x, y in positions:
+            column = min(max(int(x * cell_x), 0), columns - 1)
+            row = min(max(int(y * cell_y), 0), rows - 1)
+            index = row * columns + column
+            if counts[index] < 255:
+                counts[index] += 1
+        # One RGBA pixel per cell, more opaque the more points it holds
+        pixels = bytearray(columns * rows * 4)
+        pixels[0::4] = bytes([colour[0]]) * len(counts)
+        pixels[1::4] = bytes([colour[1]]) * len(counts)
+        pixels[2::4] = bytes([colour[2]]) * len(counts)
+        pixels[3::4] = counts.translate(bytes(min(count * 64, 255) for count in range(256)))
+        density = pygame.image.frombuffer(pixels, (columns, rows), 'RGBA')
+        self.surface.blit(pygame.transform.scale(density, (self.width, self.height)), (0, 0))
@@ -0,0 +1,143 @@
+# castle/pickups.py
+import bisect
+import json
+import random
+
+# Pickup types, their art, effects and spawn weights
+PICKUP_FILE = 'pickups.json'
+
+
+def add_arrows(player, pickup):
+    player.collected_star_dust = min(player.collected_star_dust + pickup.amount, 100)
+
+
+def heal(player, pickup):
+    player.health = min(player.health + pickup.amount, player.max_health)
+
+
+def boost(player, pickup):
+    player.boost_end_time = player.start_effect('boost', pickup.duration * 1000, player.end_boost)
+    player.speed = player.original_speed * 1.5
+
+
+def invincibility(player, pickup):
+    player.invincibility_end_time = player.start_effect('invincibility', pickup.duration * 1000,
+                                                        player.end_invincibility)
+
+
+def double_damage(player, pickup):
+    player.double_damage_end_time = player.start_effect('double_damage', pickup.duration * 1000,
+                                                        player.end_double_damage)
+    player.damage = 4
+
+
+def rapid_fire(player, pickup):
+    player.rapid_fire_end_time = player.start_effect('rapid_fire', pickup.duration * 1000, player.end_rapid_fire)
+    player.shoot_interval = 100
+    player.unlimited_arrows = True  # Enable unlimited arrows
+
+
+# Effect name used in the pickup file -> handler(player, pickup)
+PICKUP_EFFECTS = {
+    'arrows': add_arrows,
+    'heal': heal,
+    'boost': boost,
+    'invincibility': invincibility,
+    'double_damage': double_damage,
+    'rapid_fire': rapid_fire,
+}
+
+
+class Pickup:
+    __slots__ = ('id', 'name', 'image', 'effect', 'amount', 'duration', 'weight', 'power_up')
+
+    def __init__(self, id, name, image, effect=None, amount=0, duration=0, weight=0, power_up=False):
+        """
+        Initializes a Pickup type.
+        Args:
+            id (int): The type code stored on each star dust.
+            name (str): The pickup's name.
+            image (str): The asset name of its image.
+            effect (str): The name of its effect in PICKUP_EFFECTS, or None if it cannot be picked up.
+            amount (int): The arrows or health it gives.
+            duration (int): How long its effect lasts, in seconds.
+            weight (float): How often it is chosen among the random spawns of its group.
+            power_up (bool): Whether it spawns as a power-up instead of as a regular item.
+        """
+        self.id = id
+        self.name = name
+        self.image = image
+        self.effect = PICKUP_EFFECTS[effect] if effect else None
+        self.amount = amount
+        self.duration = duration
+        self.weight = weight
+        self.power_up = power_up
+
+
+class PickupRegistry:
+    def __init__(self, path=PICKUP_FILE):
+        """
+        Initializes the PickupRegistry.
+
+        Every pickup type is looked up by its type code with a single list index,
+        and random spawns are drawn with a binary search over cumulative weights.
+        Args:
+            path (str): The pickup file to load.
+        """
+        with open(path) as file:
+            entries = json.load(file)
+        self.types = [None] * (max(entry['id'] for entry in entries) + 1)
+        self.ids = {}
+        for entry in entries:
+            pickup = Pickup(**entry)
+            self.types[pickup.id] = pickup
+            self.ids[pickup.name] = pickup.id
+        self.item_ids, self.item_weights = self.cumulative_weights(power_up=False)
+        self.power_up_ids, self.power_up_weights = self.cumulative_weights(power_up=True)
+
+    def cumulative_weights(self, power_up):
+        """
+        Builds the random spawn table for the regular items or the power-ups.
+        Args:
+            power_up (bool): Which group to build it for.
+        Returns:
+            tuple: The type codes and their running weight totals.
+        """
+        ids = []
+        weights = []
+        total = 0
+        for pickup in self.types:
+            if pickup is not None and pickup.power_up == power_up and pickup.weight > 0:
+                total += pickup.weight
+                ids.append(pickup.id)
+                weights.append(total)
+        return ids, weights
+
+    @staticmethod
+    def sample(ids, weights, rng):
+        """
+        Draws a type code from a spawn table.
+        Args:
+            ids (list): The type codes.
+            weights (list): Their running weight totals.
+            rng (random.Random): The source of random numbers.
+        Returns:
+            int: The chosen type code.
+        """
+        return ids[bisect.bisect_right(weights, rng.random() * weights[-1])]
+
+    def random_item(self, rng=random):
+        """
+        Returns the type code of a random regular item.
+        Args:
+            rng (random.Random): The source of random numbers; the global one by default.
+        """
+        return self.sample(self.item_ids, self.item_weights, rng)
+
+    def random_power_up(self, rng=random):
+        """
+        Returns the type code of a random power-up.
+        Args:
+            rng (random.Random): The source of random numbers; the global one by default.
+        """
+        return self.sample(self.power_up_ids, self.power_up_weights, rng)
@@ -1,13 +1,20 @@
 # castle/player.py
 import pygame
 import time
+import numpy as np
+from projectiles import PLAYER_LASER
 
 class Player:
-    def __init__(self, playable_area_size):
+    LASER_SPEED = 10
+    LASER_DAMAGE = 5
+    LASER_SIZE = 5
+
+    def __init__(self, playable_area_size, projectiles, timers):
         self.original_speed = 5
         self.speed = self.original_speed
         self.size = 25
         self.position = [playable_area_size // 2, playable_area_size // 2]
+        self.previous_position = tuple(self.position)  # Position before the last tick, for drawing between ticks
         self.last_direction = (1, 0)
         self.health = 100
         self.max_health = 100
@@ -16,10 +23,12 @@ class Player:
         self.invincibility_end_time = None
         self.double_damage_end_time = None
         self.rapid_fire_end_time = None
+        self.timers = timers
+        self.effect_timers = {}  # Effect name -> timer that ends it
         self.laser_cost = 1
-        self.lasers = []
+        self.projectiles = projectiles
         self.playable_area_size = playable_area_size
-        self.last_spawn_time = pygame.time.get_ticks()
+        self.last_spawn_time = timers.now()
         self.spawn_interval = 2000
         self.damage = 2
         self.shoot_interval = 200
@@ -58,83 +67,71 @@ class Player:
             y - self.size < border_thickness or y + self.size > self.playable_area_size - border_thickness
 
     def check_collisions(self, stardust_manager):
-        for star_dust in stardust_manager.star_dust_list[:]:
-            dx = self.position[0] - star_dust['pos'][0]
-            dy = self.position[1] - star_dust['pos'][1]
+        pickup_radius = self.size + stardust_manager.STAR_DUST_SIZE / 2
+        pickup_types = stardust_manager.pickups.types
+        for star_dust in stardust_manager.star_dust_near(self.position, pickup_radius):
+            pickup = pickup_types[star_dust.type]
+            if pickup.effect is None:
+                continue
+            dx = self.position[0] - star_dust.x
+            dy = self.position[1] - star_dust.y
             distance = (dx ** 2 + dy ** 2) ** 0.5
-            if distance < self.size + stardust_manager.STAR_DUST_SIZE / 2:
-                if star_dust['type'] == 'arrow1':
-                    self.collected_star_dust = min(self.collected_star_dust + 1, 100)
-                    stardust_manager.star_dust_list.remove(star_dust)
-                elif star_dust['type'] == 'boost':
-                    self.boost_end_time = pygame.time.get_ticks() + stardust_manager.BOOST_DURATION * 1000
-                    self.speed = self.original_speed * 1.5
-                    stardust_manager.star_dust_list.remove(star_dust)
-                elif star_dust['type'] == 'health':
-                    self.health = min(self.health + 10, self.max_health)
-                    stardust_manager.star_dust_list.remove(star_dust)
-                elif star_dust['type'] == 'arrow_stack':
-                    self.collected_star_dust = min(self.collected_star_dust + 5, 100)
-                    stardust_manager.star_dust_list.remove(star_dust)
-                elif star_dust['type'] == 'mushroom':
-                    self.health = min(self.health + 5, self.max_health)
-                    stardust_manager.star_dust_list.remove(star_dust)
-                elif star_dust['type'] == 'invincibility':
-                    self.invincibility_end_time = pygame.time.get_ticks() + stardust_manager.INVINCIBILITY_DURATION * 1000
-                    stardust_manager.star_dust_list.remove(star_dust)
-                    stardust_manager.active_power_up = None
-                elif star_dust['type'] == 'double_damage':
-                    self.double_damage_end_time = pygame.time.get_ticks() + stardust_manager.DOUBLE_DAMAGE_DURATION * 1000
-                    self.damage = 4
-                    stardust_manager.star_dust_list.remove(star_dust)
-                    stardust_manager.active_power_up = None
-                elif star_dust['type'] == 'rapid_fire':
-                    self.rapid_fire_end_time = pygame.time.get_ticks() + stardust_manager.RAPID_FIRE_DURATION * 1000
-                    self.shoot_interval = 100
-                    self.unlimited_arrows = True  # Enable unlimited arrows
-                    stardust_manager.star_dust_list.remove(star_dust)
-                    stardust_manager.active_power_up = None
+            if distance < pickup_radius:
+                pickup.effect(self, pickup)
+                stardust_manager.remove_star_dust(star_dust)
 
     def shoot_laser(self):
-        if self.rapid_fire_end_time and pygame.time.get_ticks() < self.rapid_fire_end_time:
-            self.lasers.append({'pos': self.position[:], 'dir': self.last_direction})
+        if self.rapid_fire_end_time:
+            self.spawn_laser()
         elif self.collected_star_dust >= self.laser_cost:
-            self.lasers.append({'pos': self.position[:], 'dir': self.last_direction})
+            self.spawn_laser()
             self.collected_star_dust -= self.laser_cost
 
-    def handle_laser_movement(self, stardust_manager):
-        for laser in self.lasers[:]:
-            laser['pos'][0] += laser['dir'][0] * 10
-            laser['pos'][1] += laser['dir'][1] * 10
-            if laser['pos'][0] < 0 or laser['pos'][0] > self.playable_area_size or \
-                    laser['pos'][1] < 0 or laser['pos'][1] > self.playable_area_size:
-                self.lasers.remove(laser)
-                continue
-            if stardust_manager.check_laser_collision(laser['pos']):
-                self.lasers.remove(laser)
+    def spawn_laser(self):
+        self.projectiles.spawn(PLAYER_LASER, 0, self.position[0], self.position[1], self.last_direction,
+                               self.LASER_SPEED, self.LASER_DAMAGE, self.LASER_SIZE, self.LASER_SIZE)
+
+    def handle_laser_collisions(self, stardust_manager):
+        # Lasers are moved by the projectile buffer; here they only stop at star dust
+        lasers = self.projectiles.select(kind=PLAYER_LASER)
+        hit = np.zeros(len(self.projectiles), dtype=bool)
+        for index in np.flatnonzero(lasers):
+            if stardust_manager.check_laser_collision(self.projectiles.pos[index]):
+                hit[index] = True
+        if hit.any():
+            self.projectiles.remove(hit)
 
     def take_damage(self, amount):
-        if not self.invincibility_end_time or pygame.time.get_ticks() > self.invincibility_end_time:
+        if not self.invincibility_end_time:
             self.health = max(self.health - amount, 0)
 
-    def update_status(self):
-        if self.boost_end_time and pygame.time.get_ticks() > self.boost_end_time:
-            self.speed = self.original_speed
-            self.boost_end_time = None
-        if self.invincibility_end_time and pygame.time.get_ticks() > self.invincibility_end_time:
-            self.invincibility_end_time = None
-        if self.double_damage_end_time and pygame.time.get_ticks() > self.double_damage_end_time:
-            self.damage = 2
-            self.double_damage_end_time = None
-        if self.rapid_fire_end_time and pygame.time.get_ticks() > self.rapid_fire_end_time:
-            self.shoot_interval = 200
-            self.unlimited_arrows = False  # Disable unlimited arrows
-            self.rapid_fire_end_time = None
+    def start_effect(self, name, duration, end):
+        # Picking up an effect that is already running restarts its timer
+        self.timers.cancel(self.effect_timers.get(name))
+        end_time = self.timers.now() + duration
+        self.effect_timers[name] = self.timers.schedule_at(end_time, end)
+        return end_time
+
+    def end_boost(self):
+        self.speed = self.original_speed
+        self.boost_end_time = None
+
+    def end_invincibility(self):
+        self.invincibility_end_time = None
+
+    def end_double_damage(self):
+        self.damage = 2
+        self.double_damage_end_time = None
+
+    def end_rapid_fire(self):
+        self.shoot_interval = 200
+        self.unlimited_arrows = False  # Disable unlimited arrows
+        self.rapid_fire_end_time = None
  # Handle shooting when spacebar is held down
     def handle_shooting(self, keys):
         if keys[pygame.K_SPACE]:
             #
-            now = pygame.time.get_ticks()
+            now = self.timers.now()
             # Check if the player has rapid fire power-up and if the shoot interval has passed
             if now - self.last_shot_time >= self.shoot_interval:
                 self.shoot_laser()
@@ -0,0 +1,57 @@
+# castle/pool.py
+
+
+class ObjectPool:
+    def __init__(self, factory, capacity):
+        """
+        Initializes the ObjectPool.
+
+        Released objects are kept and handed out again by acquire, so short-lived
+        objects are reused instead of being allocated and collected over and over.
+        Args:
+            factory (callable): Builds a new object when the pool is empty.
+            capacity (int): The most released objects kept for reuse.
+        """
+        self.factory = factory
+        self.capacity = capacity
+        self.free = []
+        self.in_use = 0
+        self.hits = 0  # Acquires served from the pool
+        self.misses = 0  # Acquires that had to build a new object
+        self.high_water = 0  # Most objects in use at once
+
+    def acquire(self):
+        """
+        Returns a pooled object, or a new one if none is free. The caller resets its fields.
+        Returns:
+            object: The object.
+        """
+        if self.free:
+            self.hits += 1
+            obj = self.free.pop()
+        else:
+            self.misses += 1
+            obj = self.factory()
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """
+        Returns an object to the pool. It is dropped if the pool is full.
+        Args:
+            obj (object): An object from acquire that is no longer referenced elsewhere.
+        """
+        self.in_use -= 1
+        if len(self.free) < self.capacity:
+            self.free.append(obj)
+
+    def stats(self):
+        """
+        Returns the pool's statistics.
+        Returns:
+            dict: The hits, misses, high-water mark, objects in use and free objects.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'high_water': self.high_water,
+                'in_use': self.in_use, 'free': len(self.free)}
@@ -0,0 +1,322 @@
+# castle/projectiles.py
+import numpy as np
+
+# Projectile kinds
+PLAYER_LASER = 0
+WIZARD_ORB = 1
+CASTLE_LASER = 2
+
+# Starting number of projectile slots; the buffer doubles when it runs out
+PROJECTILE_CAPACITY = 256
+
+# Ticks a projectile of each kind lives before it is removed, or None to live until it leaves the world
+PROJECTILE_TTL = {
+    PLAYER_LASER: 300,
+    WIZARD_ORB: 900,
+    CASTLE_LASER: 300,
+}
+# Most projectiles of each kind a single owner may have in flight, or None for no limit
+PROJECTILE_OWNER_CAP = {
+    PLAYER_LASER: 60,
+    WIZARD_ORB: 8,
+    CASTLE_LASER: 60,
+}
+# Whether a spawn over the cap removes that owner's oldest projectile instead of being refused
+PROJECTILE_EVICT_OLDEST = {
+    PLAYER_LASER: True,
+    WIZARD_ORB: False,
+    CASTLE_LASER: True,
+}
+
+
+class ProjectileLifecycle:
+    def __init__(self, ttl=None, owner_cap=None, evict_oldest=None):
+        """
+        Initializes the ProjectileLifecycle.
+
+        Decides when projectiles die: after a time to live, and when an owner
+        fires past its cap. Leaving the world is handled by the buffer itself.
+        Args:
+            ttl (dict): Ticks each kind lives, None for no limit.
+            owner_cap (dict): Most live projectiles of each kind per owner, None for no limit.
+            evict_oldest (dict): Whether each kind evicts the oldest projectile when over the cap.
+        """
+        self.ttl = PROJECTILE_TTL if ttl is None else ttl
+        self.owner_cap = PROJECTILE_OWNER_CAP if owner_cap is None else owner_cap
+        self.evict_oldest = PROJECTILE_EVICT_OLDEST if evict_oldest is None else evict_oldest
+        # Lifetime of every kind, indexed by kind, so expiry is a single vectorized comparison
+        self.ttl_by_kind = np.full(max([CASTLE_LASER, *self.ttl]) + 1, np.iinfo(np.int32).max, dtype=np.int32)
+        for kind, ticks in self.ttl.items():
+            if ticks is not None:
+                self.ttl_by_kind[kind] = ticks
+
+    def expired(self, buffer):
+        """
+        Returns a mask over the live rows that have outlived their kind's time to live.
+        Args:
+            buffer (ProjectileBuffer): The projectiles.
+        Returns:
+            numpy.ndarray: The mask.
+        """
+        count = buffer.count
+        return buffer.age[:count] >= self.ttl_by_kind[buffer.kind[:count]]
+
+    def admit(self, buffer, kind, owner):
+        """
+        Checks an owner's cap before it fires, evicting its oldest projectile if the kind allows it.
+        Args:
+            buffer (ProjectileBuffer): The projectiles.
+            kind (int): The kind about to be spawned.
+            owner (int): The id of whatever is firing.
+        Returns:
+            bool: Whether the projectile may be spawned.
+        """
+        cap = self.owner_cap.get(kind)
+        if cap is None:
+            return True
+        owned = buffer.select(kind, owner)
+        if owned.sum() < cap:
+            return True
+        if not self.evict_oldest.get(kind, False):
+            return False
+        # Rows are kept in spawn order, so the first match is the oldest
+        oldest = np.zeros(buffer.count, dtype=bool)
+        oldest[np.argmax(owned)] = True
+        buffer.remove(oldest)
+        return True
+
+
+class ProjectileBuffer:
+    def __init__(self, playable_area_size, lifecycle=None, capacity=PROJECTILE_CAPACITY):
+        """
+        Initializes the ProjectileBuffer.
+
+        Every projectile in the game lives in one set of contiguous NumPy arrays, one
+        row per projectile, so movement, culling and hit tests run as vectorized
+        operations instead of Python loops. Live projectiles are always rows
+        0 to count - 1, in the order they were spawned.
+        Args:
+            playable_area_size (int): The size of the playable area.
+            lifecycle (ProjectileLifecycle): Decides when projectiles expire; the default policy if None.
+            capacity (int): The number of rows to allocate up front.
+        """
+        self.playable_area_size = playable_area_size
+        self.lifecycle = ProjectileLifecycle() if lifecycle is None else lifecycle
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.previous_pos = np.zeros((capacity, 2))  # Position before the last update, for drawing between ticks
+        self.vel = np.zeros((capacity, 2))
+        self.extent = np.zeros((capacity, 2))  # Hit box width and height
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.owner = np.zeros(capacity, dtype=np.int32)
+        self.damage = np.zeros(capacity)
+        self.age = np.zeros(capacity, dtype=np.int32)  # Ticks since the projectile was spawned
+        # Rows are reused as projectiles die, so spawning only allocates when the buffer grows
+        self.row_hits = 0  # Spawns that reused a free row
+        self.row_misses = 0  # Spawns that had to grow the buffer
+        self.high_water = 0  # Most projectiles alive at once
+
+    def __len__(self):
+        return self.count
+
+    def arrays(self):
+        """
+        Returns every per-projectile array.
+        """
+        return self.pos, self.previous_pos, self.vel, self.extent, self.kind, self.owner, self.damage, self.age
+
+    def grow(self):
+        """
+        Doubles the number of rows, keeping the live projectiles.
+        """
+        capacity = len(self.kind) * 2
+        for name in ('pos', 'previous_pos', 'vel', 'extent', 'kind', 'owner', 'damage', 'age'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def copy(self):
+        """
+        Returns a new buffer holding a copy of the live projectiles.
+        Returns:
+            ProjectileBuffer: The copy, which shares no arrays with this buffer.
+        """
+        copy = ProjectileBuffer(self.playable_area_size, self.lifecycle, capacity=max(self.count, 1))
+        for source, target in zip(self.arrays(), copy.arrays()):
+            target[:self.count] = source[:self.count]
+        copy.count = self.count
+        return copy
+
+    def spawn(self, kind, owner, x, y, direction, speed, damage, width, height):
+        """
+        Adds a projectile, unless its owner is at its cap and may not evict.
+        Args:
+            kind (int): PLAYER_LASER, WIZARD_ORB or CASTLE_LASER.
+            owner (int): The id of whatever fired it.
+            x (float): The x position.
+            y (float): The y position.
+            direction (tuple): The normalized direction of travel.
+            speed (float): The distance travelled per tick.
+            damage (float): The damage dealt on a hit.
+            width (float): The hit box width.
+            height (float): The hit box height.
+        Returns:
+            int: The row of the new projectile, or None if it was refused.
+        """
+        if not self.lifecycle.admit(self, kind, owner):
+            return None
+        if self.count == len(self.kind):
+            self.row_misses += 1
+            self.grow()
+        else:
+            self.row_hits += 1
+        index = self.count
+        self.pos[index] = (x, y)
+        self.previous_pos[index] = (x, y)
+        self.vel[index] = (direction[0] * speed, direction[1] * speed)
+        self.extent[index] = (width, height)
+        self.kind[index] = kind
+        self.owner[index] = owner
+        self.damage[index] = damage
+        self.age[index] = 0
+        self.count += 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        return index
+
+    def update(self):
+        """
+        Moves every projectile one tick and removes those that left the playable area or expired.
+        """
+        count = self.count
+        pos = self.pos[:count]
+        self.previous_pos[:count] = pos
+        pos += self.vel[:count]
+        self.age[:count] += 1
+        dead = ((pos < 0) | (pos > self.playable_area_size)).any(axis=1)
+        dead |= self.lifecycle.expired(self)
+        if dead.any():
+            self.remove(dead)
+
+    def remove(self, mask):
+        """
+        Removes the projectiles selected by a mask over the live rows, keeping the order of the rest.
+        Args:
+            mask (numpy.ndarray): True for every live row to remove.
+        """
+        keep = ~mask
+        remaining = int(keep.sum())
+        for array in self.arrays():
+            array[:remaining] = array[:self.count][keep]
+        self.count = remaining
+
+    def stats(self):
+        """
+        Returns the buffer's statistics.
+        Returns:
+            dict: The hits, misses, high-water mark, live projectiles and allocated rows.
+        """
+        return {'hits': self.row_hits, 'misses': self.row_misses, 'high_water': self.high_water,
+                'in_use': self.count, 'capacity': len(self.kind)}
+
+    def remove_rows(self, rows):
+        """
+        Removes the projectiles at the given rows.
+        Args:
+            rows (numpy.ndarray): The rows to remove.
+        """
+        mask = np.zeros(self.count, dtype=bool)
+        mask[rows] = True
+        self.remove(mask)
+
+    def interpolated(self, alpha):
+        """
+        Returns the positions of the live projectiles part of the way through the last update.
+        Args:
+            alpha (float): 0 for the position before the update, 1 for the position after it.
+        Returns:
+            numpy.ndarray: The positions, one row per live projectile.
+        """
+        previous = self.previous_pos[:self.count]
+        return previous + (self.pos[:self.count] - previous) * alpha
+
+    def select(self, kind=None, owner=None):
+        """
+        Returns a mask over the live rows matching a kind and/or owner.
+        Args:
+            kind (int): The kind to match, or None for any.
+            owner (int): The owner to match, or None for any.
+        Returns:
+            numpy.ndarray: The mask.
+        """
+        mask = np.ones(self.count, dtype=bool)
+        if kind is not None:
+            mask &= self.kind[:self.count] == kind
+        if owner is not None:
+            mask &= self.owner[:self.count] == owner
+        return mask
+
+    def clear(self, kind=None, owner=None):
+        """
+        Removes every projectile matching a kind and/or owner.
+        Args:
+            kind (int): The kind to match, or None for any.
+            owner (int): The owner to match, or None for any.
+        """
+        self.remove(self.select(kind, owner))
+
+    def hits(self, kind, x, y, width, height):
+        """
+        Returns a mask over the live rows of the given kind whose hit boxes overlap a rectangle.
+        Args:
+            kind (int): The kind to test.
+            x (float): The left edge of the rectangle.
+            y (float): The top edge of the rectangle.
+            width (float): The width of the rectangle.
+            height (float): The height of the rectangle.
+        Returns:
+            numpy.ndarray: The mask.
+        """
+        count = self.count
+        left = self.pos[:count, 0]
+        top = self.pos[:count, 1]
+        return (self.kind[:count] == kind) & \
+            (left < x + width) & (left + self.extent[:count, 0] > x) & \
+            (top < y + height) & (top + self.extent[:count, 1] > y)
+
+    def sweep_hits(self, kind, rects):
+        """
+        Finds the projectiles of one kind that hit each of many rectangles.
+
+        The projectiles are sorted by their left edge once, then each rectangle
+        binary searches the slice that can reach it along x and only tests that
+        slice. A projectile counts for the first rectangle it hits only.
+        Args:
+            kind (int): The kind to test.
+            rects (list): The (x, y, width, height) of every rectangle.
+        Returns:
+            list: The rows hitting each rectangle, in the order of rects.
+        """
+        rows = np.flatnonzero(self.kind[:self.count] == kind)
+        if not rows.size:
+            return [rows] * len(rects)
+        rows = rows[np.argsort(self.pos[rows, 0], kind='stable')]
+        left = self.pos[rows, 0]
+        top = self.pos[rows, 1]
+        width = self.extent[rows, 0]
+        height = self.extent[rows, 1]
+        widest = width.max()
+        used = np.zeros(rows.size, dtype=bool)
+        hits = []
+        for x, y, rect_width, rect_height in rects:
+            # Only projectiles starting within one projectile width left of the rectangle can reach it
+            start = np.searchsorted(left, x - widest, side='right')
+            stop = np.searchsorted(left, x + rect_width, side='left')
+            window = slice(start, stop)
+            hit = ~used[window] & (left[window] + width[window] > x) & \
+                (top[window] < y + rect_height) & (top[window] + height[window] > y)
+            candidates = np.flatnonzero(hit) + start
+            used[candidates] = True
+            hits.append(rows[candidates])
+        return hits
@@ -3,6 +3,12 @@ import pygame
 import math
 from utils import calculate_exp_needed
 from stardust import StarDustManager
+from assets import scaled_size, scale_image
+from background import Background
+from hud import Hud, HudElement
+from render_queue import RenderQueue
+from minimap import Minimap
+from projectiles import PLAYER_LASER, WIZARD_ORB, CASTLE_LASER
 
 # Constants for Mini-map
 MINIMAP_WIDTH = 200
@@ -10,128 +16,337 @@ MINIMAP_HEIGHT = 200
 MINIMAP_MARGIN = 10
 MINIMAP_SCALE = 0.04  # Adjust scale as needed
 
-# Constants for Boost Duration
-BOOST_DURATION = 10  # Adjust to your game's boost duration
+# Glow colour applied to the player while each power-up is active
+PLAYER_GLOWS = (
+    ('invincibility', (255, 215, 0)),  # Gold color
+    ('double_damage', (255, 0, 0)),  # Red color
+    ('rapid_fire', (0, 0, 255)),  # Blue color
+)
+# Power-ups whose glow is shown
+ENABLED_PLAYER_GLOWS = ('invincibility',)
+
+# Size to pre-scale the wall art to once at startup, or None to keep its own size
+WALL_TILE_SIZE = None
+
+def visible_tiles(start, stop, step, view_start, view_size):
+    """
+    Returns the positions in range(start, stop, step) whose tiles overlap the view.
+    Args:
+        start (int): The position of the first tile.
+        stop (int): The end of the tiled range.
+        step (int): The size of a tile.
+        view_start (float): The position of the view.
+        view_size (int): The size of the view.
+    Returns:
+        range: The positions of the visible tiles.
+    """
+    first = max(math.floor((view_start - start) / step), 0)
+    last = math.floor((view_start + view_size - 1 - start) / step)
+    return range(start + first * step, min(stop, start + (last + 1) * step), step)
+
+def interpolate(previous, current, alpha):
+    """
+    Returns the point part of the way from one position to another.
+    Args:
+        previous (tuple): The position at alpha 0.
+        current (tuple): The position at alpha 1.
+        alpha (float): How far along to go.
+    Returns:
+        tuple: The interpolated position.
+    """
+    return (previous[0] + (current[0] - previous[0]) * alpha,
+            previous[1] + (current[1] - previous[1]) * alpha)
 
 class Renderer:
-    def __init__(self, screen, background_img, star_img, boost_img, arrow1_img, castle_img,
-                 health_img, arrow_img, arrow_stack_img, mushroom_img, wall_img, laser_img,
-                 invincibility_img, double_damage_img, rapid_fire_img, menu_img,
-                 screen_width, screen_height, playable_area_size):
+    def __init__(self, screen, assets, screen_width, screen_height, playable_area_size,
+                 rotation_cache, text_renderer, pickups, dirty_rects=False, internal_resolution=None):
         """
         Initializes the Renderer.
         Args:
             screen (pygame.Surface): The screen to draw on.
-            background_img (pygame.Surface): The background image.
-            star_img (pygame.Surface): The player's star image.
-            boost_img (pygame.Surface): The boost stardust image.
-            arrow1_img (pygame.Surface): The arrow1 stardust image.
-            castle_img (pygame.Surface): The castle image.
-            health_img (pygame.Surface): The health stardust image.
-            arrow_img (pygame.Surface): The arrow image.
-            arrow_stack_img (pygame.Surface): The arrow_stack stardust image.
-            mushroom_img (pygame.Surface): The mushroom stardust image.
-            wall_img (pygame.Surface): The wall image.
-            laser_img (pygame.Surface): The laser image.
-            invincibility_img (pygame.Surface): The invincibility power-up image.
-            double_damage_img (pygame.Surface): The double damage power-up image.
-            rapid_fire_img (pygame.Surface): The rapid fire power-up image.
-            menu_img (pygame.Surface): The menu button image.
+            assets (AssetManager): The loaded game images.
             screen_width (int): The width of the screen.
             screen_height (int): The height of the screen.
             playable_area_size (int): The size of the playable area.
+            rotation_cache (RotationCache): The shared cache of rotated sprites.
+            text_renderer (TextRenderer): The shared font and text cache.
+            pickups (PickupRegistry): The pickup types, for their images and the boost duration.
+            dirty_rects (bool): Whether to push only the changed parts of the screen to the display.
+            internal_resolution (tuple): The size to render the world at before it is scaled up to the
+                screen, or None to render it at screen size. The camera shows the same part of the
+                world either way; only the detail changes.
         """
         self.screen = screen
-        self.background_img = background_img
-        self.star_img = star_img
-        self.boost_img = boost_img
-        self.arrow1_img = arrow1_img
-        self.castle_img = castle_img
-        self.health_img = health_img
-        self.arrow_img = arrow_img
-        self.arrow_stack_img = arrow_stack_img
-        self.mushroom_img = mushroom_img
-        self.wall_img = wall_img
-        self.laser_img = laser_img
-        self.invincibility_img = invincibility_img
-        self.double_damage_img = double_damage_img
-        self.rapid_fire_img = rapid_fire_img
-        self.menu_img = menu_img
+        self.assets = assets
+        # The camera always shows a screen's worth of world pixels
+        self.view_width, self.view_height = screen_width, screen_height
+        canvas_width, canvas_height = internal_resolution or (screen_width, screen_height)
+        self.low_res = (canvas_width, canvas_height) != (screen_width, screen_height)
+        # Canvas pixels per world pixel. At a lower internal resolution sprites are pre-scaled by it
+        # and draw positions are multiplied by it, so the world is drawn smaller rather than zoomed in
+        self.sprite_scale = (canvas_width / screen_width, canvas_height / screen_height) if self.low_res else None
+        self.world_scale_x, self.world_scale_y = self.sprite_scale or (1, 1)
+        self.background = Background(assets.image('background'), playable_area_size, canvas_width, canvas_height,
+                                     scale=self.sprite_scale)
+        self.star_img = assets.image('archer')
+        self.boost_img = assets.image('bolt')
+        self.arrow1_img = assets.image('arrow1')
+        self.castle_size = assets.image('castle').get_size()
+        self.castle_img = assets.image('castle', self.sprite_scale)
+        self.health_img = assets.image('health')
+        self.arrow_img = assets.image('arrow')
+        self.arrow_stack_img = assets.image('arrow_stack')
+        self.mushroom_img = assets.image('mushroom')
+        self.wall_img = assets.image('wall')
+        if WALL_TILE_SIZE:
+            self.wall_img = pygame.transform.smoothscale(self.wall_img, WALL_TILE_SIZE)
+        self.wall_size = self.wall_img.get_size()  # In world pixels
+        if self.sprite_scale:
+            self.wall_img = scale_image(self.wall_img, self.sprite_scale)
+        self.laser_img = assets.image('laser')
+        self.orb_img = assets.image('orb', self.sprite_scale)
+        self.invincibility_img = assets.image('invincibility')
+        self.double_damage_img = assets.image('double_damage')
+        self.rapid_fire_img = assets.image('rapid_fire')
+        self.menu_img = assets.image('menu')
+        # Star dust images, indexed by type code
+        self.star_dust_images = [assets.image(pickup.image, self.sprite_scale) if pickup else None
+                                 for pickup in pickups.types]
+        self.boost_duration = pickups.types[pickups.ids['boost']].duration
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.playable_area_size = playable_area_size
+        self.rotation_cache = rotation_cache
+        self.player_sprites = {}
+        self.text = text_renderer
         self.menu_button_rect = self.menu_img.get_rect(bottomright=(screen_width, screen_height))
 
-    def draw_scene(self, player, stardust_manager, castle_pos, castle_health, wizard_manager):
+        # In dirty-rect mode the world is composed off-screen, and the HUD group copies
+        # only the areas that changed from it onto the screen
+        self.dirty_rects = dirty_rects
+        # At a lower internal resolution the world is composed off-screen and scaled up once per frame
+        if self.low_res or dirty_rects:
+            self.canvas = pygame.Surface((canvas_width, canvas_height)).convert()
+        else:
+            self.canvas = screen
+        # The screen-sized copy of the world that sits under the HUD
+        self.world_frame = pygame.Surface((screen_width, screen_height)).convert() if self.low_res else self.canvas
+        self.scale_x = screen_width / canvas_width
+        self.scale_y = screen_height / canvas_height
+        self.render_queue = RenderQueue(self.view_width, self.view_height, self.sprite_scale)
+        # Castle lasers are plain squares; drawing them from one surface lets them be batched
+        self.castle_laser_img = pygame.Surface(scaled_size((5, 5), self.sprite_scale)).convert()
+        self.castle_laser_img.fill((255, 0, 0))
+        self.frame_rects = []
+        self.last_frame_rects = []
+        self.last_offset = None
+        self.full_redraw = True
+        self.hud = Hud(dirty_rects)
+        if dirty_rects:
+            self.hud.clear(screen, self.world_frame)
+        self.build_hud()
+
+    def build_hud(self):
+        """
+        Creates the HUD elements. Each one re-renders only when its value changes.
         """
-        Draws the entire scene including the background, player, stardust, lasers, castle, UI, and mini-map.
+        white = (255, 255, 255)
+        self.arrows_label = HudElement(lambda count: self.text.render(f'ARROWS: {count}', 36, white), (10, 10))
+        self.boost_bar = HudElement(lambda width: self.render_bar(width, 10), (10, 50))
+        self.double_damage_label = HudElement(
+            lambda pulse: self.text.render_tinted('Double Damage', 36, (255, pulse, pulse)), (10, 80))
+        self.rapid_fire_label = HudElement(
+            lambda pulse: self.text.render_tinted('Rapid Fire', 36, (255, pulse, pulse)), (10, 110))
+        self.level_label = HudElement(lambda level: self.text.render(f'Level: {level}', 36, white),
+                                      (10, self.screen_height - 50))
+        self.exp_bar = HudElement(lambda width: self.render_bar(width, 10), (10, self.screen_height - 30))
+        self.minimap_layer = Minimap(MINIMAP_WIDTH, MINIMAP_HEIGHT, self.playable_area_size)
+        self.minimap = HudElement(lambda version: self.minimap_layer.surface,
+                                  (self.screen_width - MINIMAP_WIDTH - MINIMAP_MARGIN, MINIMAP_MARGIN))
+        self.menu_button = HudElement(lambda shown: self.menu_img, self.menu_button_rect.topleft)
+        self.hud.add(self.arrows_label, self.boost_bar, self.double_damage_label, self.rapid_fire_label,
+                     self.level_label, self.exp_bar, self.minimap, self.menu_button)
+
+    def render_bar(self, width, height):
+        """
+        Renders a 100 pixel red bar filled with green up to the given width.
         Args:
-            player (Player): The player object.
-            stardust_manager (StarDustManager): The stardust manager object.
-            castle_pos (tuple): The position of the castle.
-            castle_health (int): The health of the castle.
-            wizard_manager (WizardManager): The wizard manager object.
+            width (int): The width of the green part.
+            height (int): The height of the bar.
+        Returns:
+            pygame.Surface: The rendered bar.
+        """
+        bar = pygame.Surface((100, height))
+        bar.fill((255, 0, 0))
+        pygame.draw.rect(bar, (0, 255, 0), (0, 0, width, height))
+        return bar
+
+    def mark(self, *rects):
+        """
+        Records areas of the world drawn this frame, so dirty-rect mode can update them.
+        Args:
+            rects (pygame.Rect): The areas touched by the draw calls.
+        """
+        if self.dirty_rects:
+            self.frame_rects.extend(rect for rect in rects if rect.width and rect.height)
+
+    def invalidate(self):
+        """
+        Forces the next frame to redraw the whole screen, e.g. after an overlay was drawn over it.
+        """
+        self.full_redraw = True
+
+    def present(self):
+        """
+        Draws the HUD and pushes the frame to the display. In dirty-rect mode only the areas
+        that changed since the last frame are pushed, unless the camera moved.
         """
-        offset_x = player.position[0] - self.screen_width // 2
-        offset_y = player.position[1] - self.screen_height // 2
-        self.screen.blit(self.background_img, (-offset_x, -offset_y))
+        if self.low_res:
+            world_frame = self.world_frame if self.dirty_rects else self.screen
+            pygame.transform.scale(self.canvas, (self.screen_width, self.screen_height), world_frame)
+        if not self.dirty_rects:
+            self.hud.draw(self.screen)
+            pygame.display.flip()
+            return
+        if self.full_redraw:
+            self.hud.repaint_rect(self.screen.get_rect())
+        else:
+            self.hud.repaint_rects([self.to_screen_rect(rect) for rect in self.last_frame_rects + self.frame_rects])
+        pygame.display.update(self.hud.draw(self.screen))
+        self.last_frame_rects = self.frame_rects
+        self.frame_rects = []
+        self.full_redraw = False
+
+    def to_screen_rect(self, rect):
+        """
+        Converts an area of the canvas to the area of the screen it is scaled onto.
+        Args:
+            rect (pygame.Rect): The canvas area.
+        Returns:
+            pygame.Rect: The screen area.
+        """
+        if not self.low_res:
+            return rect
+        left = int(rect.left * self.scale_x)
+        top = int(rect.top * self.scale_y)
+        return pygame.Rect(left, top, math.ceil(rect.right * self.scale_x) - left, math.ceil(rect.bottom * self.scale_y) - top)
+
+    def draw_scene(self, simulation, alpha=1.0):
+        """
+        Draws the entire scene including the background, player, stardust, lasers, castle, wizards, UI, and mini-map.
+        Moving things are drawn between where they were before the last tick and where they are now.
+        Call present() afterwards to show it.
+        Args:
+            simulation (Simulation): The game state.
+            alpha (float): How far to draw between the last two ticks, from 0 to 1.
+        """
+        player = simulation.player
+        stardust_manager = simulation.stardust_manager
+        wizard_manager = simulation.wizard_manager
+        projectiles = simulation.projectiles
+        castle = simulation.castle
+        player_x, player_y = interpolate(player.previous_position, player.position, alpha)
+        offset_x = round(player_x) - self.view_width // 2
+        offset_y = round(player_y) - self.view_height // 2
+        # Everything on screen moves when the camera does
+        if (offset_x, offset_y) != self.last_offset:
+            self.full_redraw = True
+            self.last_offset = (offset_x, offset_y)
+        self.render_queue.set_camera(offset_x, offset_y)
+        self.canvas.fill((0, 0, 0))
+        self.background.draw(self.canvas, offset_x, offset_y)
         self.draw_border(offset_x, offset_y)
         self.draw_player(player)
-        self.draw_star_dust(stardust_manager.star_dust_list, offset_x, offset_y)
-        self.draw_lasers(player.lasers, offset_x, offset_y)
-        self.draw_castle(castle_pos, castle_health, offset_x, offset_y)
-        self.draw_ui(player)
-        self.draw_minimap(player.position, castle_pos, wizard_manager)
+        self.draw_star_dust(stardust_manager.star_dust_in_rect(offset_x, offset_y, self.view_width, self.view_height),
+                            offset_x, offset_y)
+        projectile_positions = projectiles.interpolated(alpha)
+        self.draw_lasers(projectiles, projectile_positions, offset_x, offset_y)
+        self.draw_castle(castle.position, castle.health, offset_x, offset_y)
+        self.draw_castle_lasers(projectiles, projectile_positions, offset_x, offset_y)
+        self.draw_wizards(wizard_manager, projectiles, projectile_positions, alpha, offset_x, offset_y)
+        self.draw_ui(player, simulation.time())
+        self.draw_minimap(player, castle.position, wizard_manager, stardust_manager, projectiles)
         self.draw_menu_button()
         self.draw_game_over(player)
 
     def draw_menu_button(self):
         """
-        Draws the menu button in the bottom right corner.
+        Shows the menu button in the bottom right corner.
+        """
+        self.menu_button.set_value(True)
+
+    def flush_queue(self):
+        """
+        Draws the queued sprites onto the canvas.
         """
-        self.screen.blit(self.menu_img, self.menu_button_rect.topleft)
+        self.mark(*self.render_queue.flush(self.canvas, doreturn=self.dirty_rects))
 
-    def draw_wizards(self, wizard_manager, player):
+    def draw_wizards(self, wizard_manager, projectiles, projectile_positions, alpha, offset_x, offset_y):
         """
-        Draws the wizards and their orbs.
+        Draws the wizards, their health bars and their orbs.
         Args:
             wizard_manager (WizardManager): The wizard manager object.
-            player (Player): The player object.
+            projectiles (ProjectileBuffer): Every laser and orb in flight.
+            projectile_positions (numpy.ndarray): Where to draw each projectile.
+            alpha (float): How far to draw between the last two ticks, from 0 to 1.
+            offset_x (int): The x offset for drawing.
+            offset_y (int): The y offset for drawing.
         """
-        for wizard in wizard_manager.wizards:
-            for orb in wizard.orbs[:]:
-                orb_rect = pygame.Rect(orb['pos'][0], orb['pos'][1], wizard.orb_image.get_width(), wizard.orb_image.get_height())
-                player_rect = pygame.Rect(player.position[0] - player.size, player.position[1] - player.size, player.size * 2, player.size * 2)
-                if player_rect.colliderect(orb_rect):
-                    player.take_damage(5)
+        view_rect = self.canvas.get_rect()
+        positions = [interpolate(wizard.previous_position, wizard.position, alpha) for wizard in wizard_manager.wizards]
+        for wizard, (x, y) in zip(wizard_manager.wizards, positions):
+            self.render_queue.add_centered(self.rotation_cache.scale(wizard.image, self.sprite_scale), x, y)
+        self.flush_queue()
+        scale_x, scale_y = self.world_scale_x, self.world_scale_y
+        for wizard, (x, y) in zip(wizard_manager.wizards, positions):
+            # Draw wizard health bar
+            health_bar_length = wizard.size * 2 * scale_x
+            health_bar_x = (x - offset_x - wizard.size) * scale_x
+            health_bar_y = (y - offset_y + wizard.size + 10) * scale_y
+            health_bar_rect = pygame.Rect(health_bar_x, health_bar_y, health_bar_length, 5 * scale_y)
+            if view_rect.colliderect(health_bar_rect):
+                health_ratio = wizard.health / wizard.max_health
+                self.mark(pygame.draw.rect(self.canvas, (255, 0, 0), health_bar_rect))
+                pygame.draw.rect(self.canvas, (0, 255, 0),
+                                 (health_bar_x, health_bar_y, health_ratio * health_bar_length, 5 * scale_y))
+        for x, y in projectile_positions[projectiles.select(kind=WIZARD_ORB)].tolist():
+            self.render_queue.add(self.orb_img, x, y)
+        self.flush_queue()
 
-    def draw_castle_lasers(self, castle_lasers, offset_x, offset_y):
+    def draw_castle_lasers(self, projectiles, projectile_positions, offset_x, offset_y):
         """
         Draws the castle's lasers.
         Args:
-            castle_lasers (list): List of the castle's lasers.
+            projectiles (ProjectileBuffer): Every laser and orb in flight.
+            projectile_positions (numpy.ndarray): Where to draw each projectile.
             offset_x (int): The x offset for drawing.
             offset_y (int): The y offset for drawing.
         """
-        for laser in castle_lasers:
-            pygame.draw.rect(self.screen, (255, 0, 0), (laser['pos'][0] - offset_x, laser['pos'][1] - offset_y, 5, 5))
+        for x, y in projectile_positions[projectiles.select(kind=CASTLE_LASER)].tolist():
+            self.render_queue.add(self.castle_laser_img, x, y)
+        self.flush_queue()
 
     def draw_border(self, offset_x, offset_y):
         """
         Draws a border around the playable area using the wall image.
+        Only the wall tiles that intersect the camera are blitted.
         Args:
             offset_x (int): The x offset for drawing.
             offset_y (int): The y offset for drawing.
         """
-        wall_width, wall_height = self.wall_img.get_size()
+        wall_width, wall_height = self.wall_size
+        view_width, view_height = self.view_width, self.view_height
+        scale_x, scale_y = self.world_scale_x, self.world_scale_y
         # Draw top and bottom borders just outside the playable area
-        for x in range(-wall_width, self.playable_area_size + wall_width * 2, wall_width):
-            self.screen.blit(self.wall_img, (x - offset_x, -wall_height - offset_y))
-            self.screen.blit(self.wall_img, (x - offset_x, self.playable_area_size - offset_y))
+        for y in (-wall_height, self.playable_area_size):
+            if y < offset_y + view_height and y + wall_height > offset_y:
+                for x in visible_tiles(-wall_width, self.playable_area_size + wall_width * 2, wall_width, offset_x, view_width):
+                    self.canvas.blit(self.wall_img, ((x - offset_x) * scale_x, (y - offset_y) * scale_y))
         # Draw left and right borders just outside the playable area
-        for y in range(-wall_height, self.playable_area_size + wall_height * 2, wall_height):
-            self.screen.blit(self.wall_img, (-wall_width - offset_x, y - offset_y))
-            self.screen.blit(self.wall_img, (self.playable_area_size - offset_x, y - offset_y))
+        for x in (-wall_width, self.playable_area_size):
+            if x < offset_x + view_width and x + wall_width > offset_x:
+                for y in visible_tiles(-wall_height, self.playable_area_size + wall_height * 2, wall_height, offset_y, view_height):
+                    self.canvas.blit(self.wall_img, ((x - offset_x) * scale_x, (y - offset_y) * scale_y))
 
     def draw_player(self, player):
         """
@@ -139,42 +354,53 @@ class Renderer:
         Args:
             player (Player): The player object.
         """
-        scaled_star_img = pygame.transform.scale(self.star_img, (player.size * 2, player.size * 2))
-        # Apply invincibility effect
-        if player.invincibility_end_time and pygame.time.get_ticks() < player.invincibility_end_time:
-            # Apply a gold glow aura beind the player
-            gold_glow = pygame.Surface(scaled_star_img.get_size())
-            gold_glow.fill((255, 215, 0))  # Gold color
-            scaled_star_img.blit(gold_glow, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-        # # Apply double damage effect
-        # if player.double_damage_end_time and pygame.time.get_ticks() < player.double_damage_end_time:
-        #     # Apply a red glow effect to outline the player
-        #     red_glow = pygame.Surface(scaled_star_img.get_size())
-        #     red_glow.fill((255, 0, 0))  # Red color
-        #     scaled_star_img.blit(red_glow, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-        # # Apply rapid fire effect
-        # if player.rapid_fire_end_time and pygame.time.get_ticks() < player.rapid_fire_end_time:
-        #     # Apply a blue glow effect to outline the player
-        #     blue_glow = pygame.Surface(scaled_star_img.get_size())
-        #     blue_glow.fill((0, 0, 255))  # Blue color
-        #     scaled_star_img.blit(blue_glow, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-
-        self.screen.blit(scaled_star_img, (self.screen_width // 2 - player.size, self.screen_height // 2 - player.size))
+        # Apply a glow for each active power-up
+        glows = []
+        for effect, colour in PLAYER_GLOWS:
+            if effect in ENABLED_PLAYER_GLOWS and getattr(player, f'{effect}_end_time'):
+                glows.append(colour)
+        scale_x, scale_y = self.world_scale_x, self.world_scale_y
+        # The camera is centred on the player
+        centre_x = self.view_width // 2 * scale_x
+        centre_y = self.view_height // 2 * scale_y
+        scaled_star_img = self.player_sprite(player.size, tuple(glows))
+        self.mark(self.canvas.blit(scaled_star_img, (centre_x - player.size * scale_x, centre_y - player.size * scale_y)))
         # Player health bar
-        health_bar_length = player.size * 2
+        health_bar_length = player.size * 2 * scale_x
         health_ratio = player.health / player.max_health
         health_bar_width = health_ratio * health_bar_length
-        pygame.draw.rect(self.screen, (255, 0, 0),
-                         (self.screen_width // 2 - player.size, self.screen_height // 2 + player.size, health_bar_length, 5))
-        pygame.draw.rect(self.screen, (0, 255, 0),
-                         (self.screen_width // 2 - player.size, self.screen_height // 2 + player.size, health_bar_width, 5))
+        health_bar_x = centre_x - player.size * scale_x
+        health_bar_y = centre_y + player.size * scale_y
+        self.mark(pygame.draw.rect(self.canvas, (255, 0, 0), (health_bar_x, health_bar_y, health_bar_length, 5 * scale_y)))
+        pygame.draw.rect(self.canvas, (0, 255, 0), (health_bar_x, health_bar_y, health_bar_width, 5 * scale_y))
         # Direction arrow
         arrow_radius = player.size + 10
         angle = math.atan2(player.last_direction[1], player.last_direction[0])
-        arrow_rotated = pygame.transform.rotate(self.arrow_img, -math.degrees(angle))
-        arrow_pos_x = self.screen_width // 2 + arrow_radius * math.cos(angle) - arrow_rotated.get_width() / 2
-        arrow_pos_y = self.screen_height // 2 + arrow_radius * math.sin(angle) - arrow_rotated.get_height() / 2
-        self.screen.blit(arrow_rotated, (arrow_pos_x, arrow_pos_y))
+        arrow_rotated = self.rotation_cache.rotate(self.arrow_img, -math.degrees(angle), self.sprite_scale)
+        arrow_pos_x = centre_x + arrow_radius * math.cos(angle) * scale_x - arrow_rotated.get_width() / 2
+        arrow_pos_y = centre_y + arrow_radius * math.sin(angle) * scale_y - arrow_rotated.get_height() / 2
+        self.mark(self.canvas.blit(arrow_rotated, (arrow_pos_x, arrow_pos_y)))
+
+    def player_sprite(self, size, glows):
+        """
+        Returns the player sprite at the given size, scaled to the canvas, with glows applied.
+        Each combination is built once and reused until the size or the active effects change.
+        Args:
+            size (int): The player size.
+            glows (tuple): The glow colours of the active effects.
+        Returns:
+            pygame.Surface: The player sprite.
+        """
+        key = (size, glows)
+        sprite = self.player_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.transform.scale(self.star_img, scaled_size((size * 2, size * 2), self.sprite_scale))
+            for colour in glows:
+                glow = pygame.Surface(sprite.get_size())
+                glow.fill(colour)
+                sprite.blit(glow, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            self.player_sprites[key] = sprite
+        return sprite
 
     def draw_star_dust(self, star_dust_list, offset_x, offset_y):
         """
@@ -184,38 +410,29 @@ class Renderer:
             offset_x (int): The x offset for drawing.
             offset_y (int): The y offset for drawing.
         """
+        images = self.star_dust_images
         for star_dust in star_dust_list:
-            if star_dust['type'] == 'boost':
-                self.screen.blit(self.boost_img, (star_dust['pos'][0] - offset_x, star_dust['pos'][1] - offset_y))
-            elif star_dust['type'] == 'health':
-                self.screen.blit(self.health_img, (star_dust['pos'][0] - offset_x, star_dust['pos'][1] - offset_y))
-            elif star_dust['type'] == 'arrow_stack':
-                self.screen.blit(self.arrow_stack_img, (star_dust['pos'][0] - offset_x, star_dust['pos'][1] - offset_y))
-            elif star_dust['type'] == 'mushroom':
-                self.screen.blit(self.mushroom_img, (star_dust['pos'][0] - offset_x, star_dust['pos'][1] - offset_y))
-            elif star_dust['type'] == 'invincibility':
-                self.screen.blit(self.invincibility_img, (star_dust['pos'][0] - offset_x, star_dust['pos'][1] - offset_y))
-            elif star_dust['type'] == 'double_damage':
-                self.screen.blit(self.double_damage_img, (star_dust['pos'][0] - offset_x, star_dust['pos'][1] - offset_y))
-            elif star_dust['type'] == 'rapid_fire':
-                self.screen.blit(self.rapid_fire_img, (star_dust['pos'][0] - offset_x, star_dust['pos'][1] - offset_y))
-            else:
-                self.screen.blit(self.arrow1_img, (star_dust['pos'][0] - offset_x, star_dust['pos'][1] - offset_y))
+            self.render_queue.add(images[star_dust.type], star_dust.x, star_dust.y)
+        self.flush_queue()
 
-    def draw_lasers(self, lasers, offset_x, offset_y):
+    def draw_lasers(self, projectiles, projectile_positions, offset_x, offset_y):
         """
         Draws the player's lasers.
         Args:
-            lasers (list): List of player lasers.
+            projectiles (ProjectileBuffer): Every laser and orb in flight.
+            projectile_positions (numpy.ndarray): Where to draw each projectile.
             offset_x (int): The x offset for drawing.
             offset_y (int): The y offset for drawing.
         """
-        for laser in lasers:
+        lasers = projectiles.select(kind=PLAYER_LASER)
+        positions = projectile_positions[lasers].tolist()
+        velocities = projectiles.vel[:projectiles.count][lasers].tolist()
+        for (x, y), (velocity_x, velocity_y) in zip(positions, velocities):
             # Rotate the laser image based on the direction
-            angle = math.degrees(math.atan2(-laser['dir'][1], laser['dir'][0]))
-            rotated_laser_img = pygame.transform.rotate(self.laser_img, angle)
-            laser_rect = rotated_laser_img.get_rect(center=(laser['pos'][0] - offset_x, laser['pos'][1] - offset_y))
-            self.screen.blit(rotated_laser_img, laser_rect.topleft)
+            angle = math.degrees(math.atan2(-velocity_y, velocity_x))
+            rotated_laser_img = self.rotation_cache.rotate(self.laser_img, angle, self.sprite_scale)
+            self.render_queue.add_centered(rotated_laser_img, x, y)
+        self.flush_queue()
 
     def draw_castle(self, castle_pos, castle_health, offset_x, offset_y):
         """
@@ -226,96 +443,87 @@ class Renderer:
             offset_x (int): The x offset for drawing.
             offset_y (int): The y offset for drawing.
         """
-        self.screen.blit(self.castle_img, (castle_pos[0] - offset_x, castle_pos[1] - offset_y))
+        scale_x, scale_y = self.world_scale_x, self.world_scale_y
+        castle_x = (castle_pos[0] - offset_x) * scale_x
+        castle_y = (castle_pos[1] - offset_y) * scale_y
+        self.mark(self.canvas.blit(self.castle_img, (castle_x, castle_y)))
         # Draw castle health bar
         if castle_health < StarDustManager.CASTLE_HEALTH:
-            health_bar_length = self.castle_img.get_width()
+            castle_width, castle_height = self.castle_size
+            health_bar_length = castle_width * scale_x
             health_ratio = castle_health / StarDustManager.CASTLE_HEALTH
             health_bar_width = health_ratio * health_bar_length
-            pygame.draw.rect(self.screen, (255, 0, 0),
-                             (castle_pos[0] - offset_x, castle_pos[1] + self.castle_img.get_height() - offset_y, health_bar_length, 5))
-            pygame.draw.rect(self.screen, (0, 255, 0),
-                             (castle_pos[0] - offset_x, castle_pos[1] + self.castle_img.get_height() - offset_y, health_bar_width, 5))
+            health_bar_y = castle_y + castle_height * scale_y
+            self.mark(pygame.draw.rect(self.canvas, (255, 0, 0), (castle_x, health_bar_y, health_bar_length, 5 * scale_y)))
+            pygame.draw.rect(self.canvas, (0, 255, 0), (castle_x, health_bar_y, health_bar_width, 5 * scale_y))
 
-    def draw_minimap(self, player_pos, castle_pos, wizard_manager):
+    def draw_minimap(self, player, castle_pos, wizard_manager, stardust_manager, projectiles):
         """
-        Draws the mini-map showing player, castle, and wizard positions.
+        Updates the mini-map showing player, castle, and wizard positions.
         Args:
-            player_pos (tuple): The position of the player.
+            player (Player): The player object.
             castle_pos (tuple): The position of the castle.
             wizard_manager (WizardManager): The wizard manager object.
+            stardust_manager (StarDustManager): The stardust manager object.
+            projectiles (ProjectileBuffer): Every laser and orb in flight.
         """
-        # Define mini-map position
-        minimap_x = self.screen_width - MINIMAP_WIDTH - MINIMAP_MARGIN
-        minimap_y = MINIMAP_MARGIN
-        # Draw mini-map background
-        pygame.draw.rect(self.screen, (50, 50, 50), (minimap_x, minimap_y, MINIMAP_WIDTH, MINIMAP_HEIGHT))
-        # Calculate scaled positions
-        scale_x = MINIMAP_WIDTH / self.playable_area_size
-        scale_y = MINIMAP_HEIGHT / self.playable_area_size
-        minimap_player_x = minimap_x + player_pos[0] * scale_x
-        minimap_player_y = minimap_y + player_pos[1] * scale_y
-        minimap_castle_x = minimap_x + castle_pos[0] * scale_x
-        minimap_castle_y = minimap_y + castle_pos[1] * scale_y
-        # Draw player position
-        pygame.draw.circle(self.screen, (0, 255, 0), (int(minimap_player_x), int(minimap_player_y)), 5)
-        # Draw castle position
-        pygame.draw.circle(self.screen, (255, 0, 0), (int(minimap_castle_x), int(minimap_castle_y)), 5)
-        # Draw wizard positions
-        for wizard in wizard_manager.wizards:
-            minimap_wizard_x = minimap_x + wizard.position[0] * scale_x
-            minimap_wizard_y = minimap_y + wizard.position[1] * scale_y
-            pygame.draw.circle(self.screen, (0, 0, 255), (int(minimap_wizard_x), int(minimap_wizard_y)), 5)  # Blue for wizard
+        item_positions = []
+        if self.minimap_layer.show_items:
+            item_positions = [(star_dust.x, star_dust.y) for star_dust in stardust_manager.star_dust_list]
+        projectile_positions = []
+        if self.minimap_layer.show_projectiles:
+            projectile_positions = projectiles.pos[:projectiles.count].tolist()
+        self.minimap_layer.update(pygame.time.get_ticks(), player.position, castle_pos,
+                                  [wizard.position for wizard in wizard_manager.wizards],
+                                  item_positions, projectile_positions)
+        self.minimap.set_value(self.minimap_layer.version)
 
-    def draw_ui(self, player):
+    def draw_ui(self, player, now):
         """
-        Draws the UI elements such as arrow1, boost bar, level, and experience bar.
+        Updates the UI elements such as arrow1, boost bar, level, and experience bar.
         Args:
             player (Player): The player object.
+            now (int): The simulation time in milliseconds.
         """
-        font = pygame.font.Font(None, 36)
-        arrow1_text = font.render(f'ARROWS: {player.collected_star_dust}', True, (255, 255, 255))
-        self.screen.blit(arrow1_text, (10, 10))
+        self.arrows_label.set_value(player.collected_star_dust)
         if player.boost_end_time:
-            boost_elapsed = (player.boost_end_time - pygame.time.get_ticks()) / 1000.0
-            boost_ratio = max(boost_elapsed / BOOST_DURATION, 0)
-            boost_bar_width = 100 * boost_ratio
-            pygame.draw.rect(self.screen, (255, 0, 0), (10, 50, 100, 10))
-            pygame.draw.rect(self.screen, (0, 255, 0), (10, 50, boost_bar_width, 10))
+            boost_elapsed = (player.boost_end_time - now) / 1000.0
+            boost_ratio = max(boost_elapsed / self.boost_duration, 0)
+            self.boost_bar.set_value(int(100 * boost_ratio))
+        else:
+            self.boost_bar.set_value(None)
         
         # Pulsing effect for text
-        pulse = abs(math.sin(pygame.time.get_ticks() / 250)) * 255  # Pulsing effect
+        pulse = int(abs(math.sin(now / 250)) * 255)  # Pulsing effect
         
-        if player.double_damage_end_time and pygame.time.get_ticks() < player.double_damage_end_time:
-            double_damage_text = font.render('Double Damage', True, (255, pulse, pulse))
-            self.screen.blit(double_damage_text, (10, 80))
+        if player.double_damage_end_time:
+            self.double_damage_label.set_value(pulse)
+        else:
+            self.double_damage_label.set_value(None)
         
-        if player.rapid_fire_end_time and pygame.time.get_ticks() < player.rapid_fire_end_time:
-            rapid_fire_text = font.render('Rapid Fire', True, (255, pulse, pulse))
-            self.screen.blit(rapid_fire_text, (10, 110))
+        if player.rapid_fire_end_time:
+            self.rapid_fire_label.set_value(pulse)
+        else:
+            self.rapid_fire_label.set_value(None)
             
-        level_text = font.render(f'Level: {player.current_level}', True, (255, 255, 255))
-        self.screen.blit(level_text, (10, self.screen_height - 50))
+        self.level_label.set_value(player.current_level)
         if player.current_level < 99:
             exp_needed = calculate_exp_needed(player.current_level)
             exp_ratio = min(player.current_experience / exp_needed, 1.0)
-            exp_bar_width = 100 * exp_ratio
-            pygame.draw.rect(self.screen, (255, 0, 0),
-                             (10, self.screen_height - 30, 100, 10))
-            pygame.draw.rect(self.screen, (0, 255, 0),
-                             (10, self.screen_height - 30, exp_bar_width, 10))
+            self.exp_bar.set_value(int(100 * exp_ratio))
+        else:
+            self.exp_bar.set_value(None)
 
     def draw_menu(self):
         """
         Draws the pause menu.
         """
-        font = pygame.font.Font(None, 74)
-        menu_text = font.render('Paused', True, (255, 255, 255))
+        self.invalidate()
+        menu_text = self.text.render('Paused', 74, (255, 255, 255))
         self.screen.blit(menu_text, (self.screen_width // 2 - menu_text.get_width() // 2, self.screen_height // 2 - 100))
-        smaller_font = pygame.font.Font(None, 50)
-        restart_text = smaller_font.render('Press R to Restart', True, (255, 255, 255))
+        restart_text = self.text.render('Press R to Restart', 50, (255, 255, 255))
         self.screen.blit(restart_text, (self.screen_width // 2 - restart_text.get_width() // 2, self.screen_height // 2))
-        quit_text = smaller_font.render('Press Q to Quit', True, (255, 255, 255))
+        quit_text = self.text.render('Press Q to Quit', 50, (255, 255, 255))
         #this will exit the game when the player presses the Q key
         self.screen.blit(quit_text, (self.screen_width // 2 - quit_text.get_width() // 2, self.screen_height // 2 + 50))
    
@@ -323,11 +531,10 @@ class Renderer:
         #ony display the game over screen if the player is dead
         if player.health > 0:
             return
-        font_large = pygame.font.Font(None, 74)
-        font_small = pygame.font.Font(None, 50)
-        loser_text = font_large.render('LOSER', True, (255, 0, 0))
-        restart_text = font_small.render('Press (R) to Restart', True, (255, 255, 255))
-        quit_text = font_small.render('Press (Q) to Quit', True, (255, 255, 255))
+        self.invalidate()
+        loser_text = self.text.render('LOSER', 74, (255, 0, 0))
+        restart_text = self.text.render('Press (R) to Restart', 50, (255, 255, 255))
+        quit_text = self.text.render('Press (Q) to Quit', 50, (255, 255, 255))
         self.screen.blit(loser_text, (self.screen_width // 2 - loser_text.get_width() // 2, self.screen_height // 2 - 100))
         self.screen.blit(restart_text, (self.screen_width // 2 - restart_text.get_width() // 2, self.screen_height // 2))
         self.screen.blit(quit_text, (self.screen_width // 2 - quit_text.get_width() // 2, self.screen_height // 2 + 50))
\ No newline at end of file
@@ -0,0 +1,88 @@
+# castle/render_queue.py
+
+
+class RenderQueue:
+    def __init__(self, view_width, view_height, scale=None):
+        """
+        Initializes the RenderQueue.
+
+        Sprites are culled against the camera when they are queued and grouped by
+        source surface, so each group is drawn with a single Surface.blits call.
+        Args:
+            view_width (int): The width of the view in world pixels.
+            view_height (int): The height of the view in world pixels.
+            scale (tuple): Target pixels per world pixel along x and y, or None for 1.
+        """
+        self.scale_x, self.scale_y = scale or (1, 1)
+        # Size of the area drawn into, in target pixels
+        self.view_width = view_width * self.scale_x
+        self.view_height = view_height * self.scale_y
+        self.offset_x = 0
+        self.offset_y = 0
+        self.batches = {}
+
+    def set_camera(self, offset_x, offset_y):
+        """
+        Moves the camera used for culling and for converting world to screen positions.
+        Args:
+            offset_x (int): The x offset for drawing.
+            offset_y (int): The y offset for drawing.
+        """
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+
+    def add(self, image, x, y):
+        """
+        Queues an image by the world position of its top left corner, unless it is off-screen.
+        Args:
+            image (pygame.Surface): The image to draw, already at the target scale.
+            x (float): The world x position.
+            y (float): The world y position.
+        """
+        self.queue(image, (x - self.offset_x) * self.scale_x, (y - self.offset_y) * self.scale_y)
+
+    def add_centered(self, image, x, y):
+        """
+        Queues an image by the world position of its centre, unless it is off-screen.
+        Args:
+            image (pygame.Surface): The image to draw, already at the target scale.
+            x (float): The world x position.
+            y (float): The world y position.
+        """
+        width, height = image.get_size()
+        self.queue(image, (x - self.offset_x) * self.scale_x - width / 2, (y - self.offset_y) * self.scale_y - height / 2)
+
+    def queue(self, image, screen_x, screen_y):
+        """
+        Queues an image by the target position of its top left corner, unless it is off-screen.
+        Args:
+            image (pygame.Surface): The image to draw.
+            screen_x (float): The x position on the target.
+            screen_y (float): The y position on the target.
+        """
+        width, height = image.get_size()
+        if screen_x >= self.view_width or screen_y >= self.view_height or \
+                screen_x + width <= 0 or screen_y + height <= 0:
+            return
+        batch = self.batches.get(image)
+        if batch is None:
+            self.batches[image] = batch = []
+        batch.append((image, (screen_x, screen_y)))
+
+    def flush(self, target, doreturn=False):
+        """
+        Draws everything queued, one blits call per source surface, and empties the queue.
+        Args:
+            target (pygame.Surface): The surface to draw on.
+            doreturn (bool): Whether to collect the drawn areas.
+        Returns:
+            list: The drawn areas if doreturn is set, otherwise an empty list.
+        """
+        drawn_rects = []
+        for batch in self.batches.values():
+            if doreturn:
+                drawn_rects.extend(target.blits(batch))
+            else:
+                target.blits(batch, doreturn=False)
+        self.batches.clear()
+        return drawn_rects
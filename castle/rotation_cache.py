@@ -0,0 +1,90 @@
+# castle/rotation_cache.py
+from collections import OrderedDict
+
+import pygame
+
+from assets import scale_image
+
+# Number of distinct angles a sprite is rotated to
+ROTATION_STEPS = 64
+# Upper bound on the number of rotated surfaces kept alive
+ROTATION_CACHE_SIZE = 4096
+
+
+class RotationCache:
+    def __init__(self, steps=ROTATION_STEPS, max_entries=ROTATION_CACHE_SIZE):
+        """
+        Initializes the RotationCache.
+
+        Rotated sprites are keyed by (image, quantized angle, scale), so every entity
+        sharing an image also shares its rotations.
+        Args:
+            steps (int): The number of angle steps in a full turn.
+            max_entries (int): The number of rotated surfaces to keep before evicting the oldest.
+        """
+        self.steps = steps
+        self.step_size = 360 / steps
+        self.max_entries = max_entries
+        self.rotations = OrderedDict()
+
+    def rotate(self, image, angle, scale=None):
+        """
+        Returns the image rotated to the nearest angle step.
+        Args:
+            image (pygame.Surface): The unrotated image.
+            angle (float): The rotation in degrees, counterclockwise.
+            scale (tuple): The x and y scale to apply after rotating, or None.
+        Returns:
+            pygame.Surface: The rotated image.
+        """
+        step = round(angle / self.step_size) % self.steps
+        key = (image, step, scale)
+        rotated = self.rotations.get(key)
+        if rotated is None:
+            rotated = pygame.transform.rotate(image, step * self.step_size)
+            if scale is not None:
+                rotated = scale_image(rotated, scale)
+            self.store(key, rotated)
+        else:
+            self.rotations.move_to_end(key)
+        return rotated
+
+    def scale(self, image, scale):
+        """
+        Returns a scaled copy of an image, such as a sprite that was rotated elsewhere.
+        Args:
+            image (pygame.Surface): The image.
+            scale (tuple): The x and y scale, or None to return the image itself.
+        Returns:
+            pygame.Surface: The scaled image.
+        """
+        if scale is None:
+            return image
+        key = (image, None, scale)
+        scaled = self.rotations.get(key)
+        if scaled is None:
+            scaled = scale_image(image, scale)
+            self.store(key, scaled)
+        else:
+            self.rotations.move_to_end(key)
+        return scaled
+
+    def store(self, key, surface):
+        """
+        Adds a surface to the cache, evicting the least recently used one when full.
+        Args:
+            key (tuple): The cache key.
+            surface (pygame.Surface): The surface.
+        """
+        self.rotations[key] = surface
+        if len(self.rotations) > self.max_entries:
+            self.rotations.popitem(last=False)
+
+    def prewarm(self, image):
+        """
+        Builds every rotation of an image up front.
+        Args:
+            image (pygame.Surface): The unrotated image.
+        """
+        for step in range(self.steps):
+            self.rotate(image, step * self.step_size)
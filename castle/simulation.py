@@ -0,0 +1,247 @@
+# castle/simulation.py
+import math
+import threading
+import time
+import numpy as np
+from player import Player
+from stardust import StarDustManager
+from wizard_manager import WizardManager
+from castle import Castle
+from projectiles import ProjectileBuffer, PLAYER_LASER, WIZARD_ORB, CASTLE_LASER
+from timers import TimerService
+from utils import gain_experience, reset_game
+from context import GameContext, SimulatedClock
+from snapshot import WorldSnapshot
+
+# Simulation ticks per second. Speeds are in pixels per tick, so this also sets the game speed
+SIMULATION_RATE = 60
+
+# Castle lasers, fired back at the player whenever a player laser hits the castle
+CASTLE_LASER_SPEED = 10
+CASTLE_LASER_DAMAGE = 2  # Scaled by castle_damage_multiplier when it lands
+CASTLE_LASER_SIZE = 5
+
+
+class Simulation:
+    def __init__(self, playable_area_size, castle_size, assets, rotation_cache, pickups, rate=SIMULATION_RATE,
+                 context=None):
+        """
+        Initializes the Simulation.
+
+        Holds the whole game state and advances it in fixed ticks. Time inside the
+        simulation is counted in ticks, so timers and spawns do not depend on how
+        often frames are drawn.
+        Args:
+            playable_area_size (int): The size of the playable area.
+            castle_size (tuple): The size of the castle.
+            assets (AssetManager): The loaded game images.
+            rotation_cache (RotationCache): The shared cache of rotated sprites.
+            pickups (PickupRegistry): The pickup types.
+            rate (int): Simulation ticks per second.
+            context (GameContext): The clock and random numbers; a simulated clock at rate
+                and an unseeded random if None.
+        """
+        self.rate = rate
+        self.step_ms = 1000 / rate
+        self.context = GameContext(SimulatedClock(rate)) if context is None else context
+        self.castle_size = castle_size
+        self.castle_damage_multiplier = 1.0
+        self.timers = TimerService(clock=self.context.clock)
+        self.projectiles = ProjectileBuffer(playable_area_size)
+        self.player = Player(playable_area_size=playable_area_size, projectiles=self.projectiles, timers=self.timers)
+        self.stardust_manager = StarDustManager(playable_area_size=playable_area_size, castle_size=castle_size,
+                                                pickups=pickups, context=self.context)
+        self.wizard_manager = WizardManager(playable_area_size, self.player, self.stardust_manager, assets,
+                                            rotation_cache, self.projectiles, self.timers, self.context)
+        self.castle = Castle(playable_area_size=playable_area_size, castle_size=castle_size, context=self.context)
+
+    @property
+    def ticks(self):
+        return self.context.clock.ticks
+
+    def time(self):
+        """
+        Returns the simulation time in milliseconds.
+        """
+        return self.context.now()
+
+    @property
+    def game_over(self):
+        return self.player.health <= 0
+
+    def reset(self, reset_castle=False):
+        """
+        Restarts the game with a fresh player, star dust and wizards.
+        Args:
+            reset_castle (bool): Whether to also move the castle and restore its health.
+        """
+        reset_game(self.player, self.stardust_manager)
+        self.wizard_manager.reset()
+        if reset_castle:
+            self.castle.reset()
+        self.player.previous_position = tuple(self.player.position)
+
+    def step(self, keys):
+        """
+        Advances the game by one tick.
+        Args:
+            keys: The pressed keys, as returned by pygame.key.get_pressed().
+        """
+        self.context.clock.advance()
+        player = self.player
+        castle = self.castle
+        stardust_manager = self.stardust_manager
+        player.previous_position = tuple(player.position)
+        player.handle_movement(keys, castle.position, self.castle_size)
+        player.check_collisions(stardust_manager)
+        self.projectiles.update()
+        player.handle_laser_collisions(stardust_manager)
+        self.timers.update()
+        player.handle_shooting(keys)  # Handle shooting when spacebar is held down
+        stardust_manager.spawn_star_dust(self.time())
+        self.wizard_manager.update(castle.position, self.castle_size)
+        self.handle_castle_laser_collision()
+        self.handle_castle_laser_hits()
+        self.handle_wizard_orb_collision()
+        self.handle_player_laser_collision_with_wizard()
+
+    def handle_castle_laser_collision(self):
+        """
+        Damages the castle with the player lasers that hit it, firing a castle laser back for each.
+        """
+        player = self.player
+        castle = self.castle
+        projectiles = self.projectiles
+        hits = projectiles.hits(PLAYER_LASER, castle.position[0], castle.position[1], castle.size[0], castle.size[1])
+        hit_count = int(hits.sum())
+        if hit_count:
+            projectiles.remove(hits)
+        for _ in range(hit_count):
+            castle.take_damage(2)
+            direction_vector = (player.position[0] - castle.position[0], player.position[1] - castle.position[1])
+            distance = math.sqrt(direction_vector[0]**2 + direction_vector[1]**2)
+            normalized_direction = (direction_vector[0] / distance, direction_vector[1] / distance)
+            projectiles.spawn(CASTLE_LASER, 0, castle.position[0], castle.position[1], normalized_direction,
+                              CASTLE_LASER_SPEED, CASTLE_LASER_DAMAGE, CASTLE_LASER_SIZE, CASTLE_LASER_SIZE)
+        if castle.health <= 0:
+            gain_experience(player, 10)
+            castle.drop_items(self.stardust_manager)
+            castle.reset()
+            self.castle_damage_multiplier += 0.1
+
+    def player_hits(self, kind):
+        """
+        Removes the projectiles of one kind that hit the player.
+        Args:
+            kind (int): The kind to test.
+        Returns:
+            list: The damage of every projectile that hit.
+        """
+        player = self.player
+        projectiles = self.projectiles
+        hits = projectiles.hits(kind, player.position[0] - player.size, player.position[1] - player.size,
+                                player.size * 2, player.size * 2)
+        if not hits.any():
+            return []
+        damage = projectiles.damage[:projectiles.count][hits].tolist()
+        projectiles.remove(hits)
+        return damage
+
+    def handle_castle_laser_hits(self):
+        """
+        Damages the player with the castle lasers that hit it.
+        """
+        for damage in self.player_hits(CASTLE_LASER):
+            self.player.take_damage(damage * self.castle_damage_multiplier)
+
+    def handle_wizard_orb_collision(self):
+        """
+        Damages the player with the wizard orbs that hit it.
+        """
+        for damage in self.player_hits(WIZARD_ORB):
+            self.player.take_damage(damage)
+
+    def handle_player_laser_collision_with_wizard(self):
+        """
+        Damages the wizards hit by player lasers, then removes the dead ones.
+        """
+        wizard_manager = self.wizard_manager
+        projectiles = self.projectiles
+        wizards = list(wizard_manager.wizards)
+        hitboxes = [(wizard.position[0] - wizard.size, wizard.position[1] - wizard.size, wizard.size * 2, wizard.size * 2)
+                    for wizard in wizards]
+        spent = []
+        for wizard, rows in zip(wizards, projectiles.sweep_hits(PLAYER_LASER, hitboxes)):
+            if rows.size:
+                for damage in projectiles.damage[rows].tolist():
+                    wizard.take_damage(damage)
+                spent.append(rows)
+        if spent:
+            projectiles.remove_rows(np.concatenate(spent))
+        # Dead wizards are collected once, after every laser has been resolved
+        dead_wizards = sum(1 for wizard in wizard_manager.wizards if wizard.health <= 0)
+        if dead_wizards:
+            gain_experience(self.player, 5 * dead_wizards)
+            wizard_manager.handle_collisions(self.player)
+
+
+class SimulationThread(threading.Thread):
+    def __init__(self, simulation, snapshots, max_catch_up_steps):
+        """
+        Initializes the SimulationThread.
+
+        Runs the simulation at its own fixed rate on a worker thread and publishes
+        a WorldSnapshot after every batch of ticks, so the main thread only handles
+        events and draws. Anything else that touches the simulation must hold lock.
+        Args:
+            simulation (Simulation): The simulation to run.
+            snapshots (SnapshotBuffer): Where to publish snapshots.
+            max_catch_up_steps (int): Most ticks run in one go before the backlog is dropped.
+        """
+        super().__init__(name='simulation', daemon=True)
+        self.simulation = simulation
+        self.snapshots = snapshots
+        self.max_catch_up_steps = max_catch_up_steps
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.paused = False
+        self.keys = None  # The latest pressed keys, handed over by the main thread
+
+    def run(self):
+        simulation = self.simulation
+        step_seconds = simulation.step_ms / 1000
+        next_tick = time.perf_counter()
+        while not self.stopped.is_set():
+            now = time.perf_counter()
+            if self.paused or self.keys is None or simulation.game_over:
+                next_tick = now
+            else:
+                steps = 0
+                with self.lock:
+                    while next_tick <= now and steps < self.max_catch_up_steps and not simulation.game_over:
+                        simulation.step(self.keys)
+                        next_tick += step_seconds
+                        steps += 1
+                    if steps:
+                        self.snapshots.publish(WorldSnapshot(simulation))
+                if steps == self.max_catch_up_steps:
+                    # Too far behind to catch up; drop the backlog rather than fall further behind
+                    next_tick = max(next_tick, now)
+            self.stopped.wait(max(next_tick - time.perf_counter(), 0.001))
+
+    def reset(self, reset_castle=False):
+        """
+        Restarts the game from the main thread and publishes the fresh state at once.
+        Args:
+            reset_castle (bool): Whether to also move the castle and restore its health.
+        """
+        with self.lock:
+            self.simulation.reset(reset_castle)
+            self.snapshots.publish(WorldSnapshot(self.simulation))
+
+    def stop(self):
+        """
+        Stops the thread and waits for it to finish.
+        """
+        self.stopped.set()
+        self.join()
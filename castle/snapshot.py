@@ -0,0 +1,126 @@
+# castle/snapshot.py
+import threading
+import time
+from stardust import StarDust
+
+
+class PlayerSnapshot:
+    # Everything the renderer reads from the player, besides its position
+    FIELDS = ('size', 'health', 'max_health', 'collected_star_dust', 'current_level', 'current_experience',
+              'last_direction', 'boost_end_time', 'invincibility_end_time', 'double_damage_end_time',
+              'rapid_fire_end_time')
+    __slots__ = FIELDS + ('position', 'previous_position')
+
+    def __init__(self, player):
+        for name in self.FIELDS:
+            setattr(self, name, getattr(player, name))
+        self.position = tuple(player.position)
+        self.previous_position = player.previous_position
+
+
+class WizardSnapshot:
+    __slots__ = ('image', 'position', 'previous_position', 'size', 'health', 'max_health')
+
+    def __init__(self, wizard):
+        self.image = wizard.image
+        self.position = tuple(wizard.position)
+        self.previous_position = wizard.previous_position
+        self.size = wizard.size
+        self.health = wizard.health
+        self.max_health = wizard.max_health
+
+
+class WizardManagerSnapshot:
+    __slots__ = ('wizards',)
+
+    def __init__(self, wizard_manager):
+        self.wizards = [WizardSnapshot(wizard) for wizard in wizard_manager.wizards]
+
+
+class StarDustSnapshot:
+    __slots__ = ('star_dust_list', 'size')
+
+    def __init__(self, stardust_manager):
+        self.star_dust_list = [StarDust(star_dust.x, star_dust.y, star_dust.type)
+                               for star_dust in stardust_manager.star_dust_list]
+        self.size = stardust_manager.STAR_DUST_SIZE
+
+    def star_dust_in_rect(self, x, y, width, height):
+        # Same overlap test as the live spatial grid, edges included
+        size = self.size
+        return [star_dust for star_dust in self.star_dust_list
+                if star_dust.x <= x + width and x <= star_dust.x + size and
+                star_dust.y <= y + height and y <= star_dust.y + size]
+
+
+class CastleSnapshot:
+    __slots__ = ('position', 'health')
+
+    def __init__(self, castle):
+        self.position = tuple(castle.position)
+        self.health = castle.health
+
+
+class WorldSnapshot:
+    def __init__(self, simulation):
+        """
+        Initializes the WorldSnapshot.
+
+        A copy of everything the renderer needs from one simulation tick. It shares
+        no mutable state with the simulation, so it can be drawn on one thread while
+        the simulation runs the next tick on another. It offers the same attributes
+        the renderer reads from a Simulation.
+        Args:
+            simulation (Simulation): The simulation to copy.
+        """
+        self.ticks = simulation.ticks
+        self.now = simulation.time()
+        self.player = PlayerSnapshot(simulation.player)
+        self.stardust_manager = StarDustSnapshot(simulation.stardust_manager)
+        self.wizard_manager = WizardManagerSnapshot(simulation.wizard_manager)
+        self.projectiles = simulation.projectiles.copy()
+        self.castle = CastleSnapshot(simulation.castle)
+
+    def time(self):
+        """
+        Returns the simulation time of the snapshot in milliseconds.
+        """
+        return self.now
+
+    @property
+    def game_over(self):
+        return self.player.health <= 0
+
+
+class SnapshotBuffer:
+    def __init__(self):
+        """
+        Initializes the SnapshotBuffer.
+
+        A double buffer of world snapshots: the simulation fills the back slot and
+        swaps it to the front, and readers always get the latest complete snapshot.
+        """
+        self.lock = threading.Lock()
+        self.front = None
+        self.back = None
+        self.published_at = 0.0
+
+    def publish(self, snapshot):
+        """
+        Makes a snapshot the latest one.
+        Args:
+            snapshot (WorldSnapshot): The snapshot, which must not be changed afterwards.
+        """
+        self.back = snapshot
+        with self.lock:
+            self.front, self.back = self.back, self.front
+            self.published_at = time.perf_counter()
+
+    def latest(self):
+        """
+        Returns the latest snapshot.
+        Returns:
+            tuple: The snapshot and the time.perf_counter() at which it was published.
+        """
+        with self.lock:
+            return self.front, self.published_at
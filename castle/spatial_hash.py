@@ -0,0 +1,134 @@
+# castle/spatial_hash.py
+import math
+
+
+class SpatialHash:
+    def __init__(self, cell_size):
+        """
+        Initializes the SpatialHash.
+
+        Items are stored as rectangles in every grid cell they overlap, so a lookup
+        only visits the cells around the queried area.
+        Args:
+            cell_size (int): The size of a grid cell.
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}  # id(item) -> (item, x, y, width, height)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def cell_range(self, x, y, width, height):
+        """
+        Returns the grid cells covered by a rectangle.
+        Args:
+            x (float): The left edge.
+            y (float): The top edge.
+            width (float): The width.
+            height (float): The height.
+        Returns:
+            list: The (column, row) of every covered cell.
+        """
+        first_column = math.floor(x / self.cell_size)
+        first_row = math.floor(y / self.cell_size)
+        last_column = math.floor((x + width) / self.cell_size)
+        last_row = math.floor((y + height) / self.cell_size)
+        return [(column, row) for column in range(first_column, last_column + 1)
+                for row in range(first_row, last_row + 1)]
+
+    def insert(self, item, x, y, width, height):
+        """
+        Adds an item with its bounding rectangle.
+        Args:
+            item: The item to add.
+            x (float): The left edge.
+            y (float): The top edge.
+            width (float): The width.
+            height (float): The height.
+        """
+        self.entries[id(item)] = (item, x, y, width, height)
+        for cell in self.cell_range(x, y, width, height):
+            self.cells.setdefault(cell, []).append(item)
+
+    def remove(self, item):
+        """
+        Removes an item, if it is stored.
+        Args:
+            item: The item to remove.
+        """
+        entry = self.entries.pop(id(item), None)
+        if entry is None:
+            return
+        for cell in self.cell_range(*entry[1:]):
+            items = self.cells[cell]
+            for index, other in enumerate(items):
+                if other is item:
+                    del items[index]
+                    break
+            if not items:
+                del self.cells[cell]
+
+    def clear(self):
+        """
+        Removes every item.
+        """
+        self.cells.clear()
+        self.entries.clear()
+
+    def query_rect(self, x, y, width, height):
+        """
+        Returns the items whose rectangles overlap a rectangle, edges included.
+        Args:
+            x (float): The left edge.
+            y (float): The top edge.
+            width (float): The width.
+            height (float): The height.
+        Returns:
+            list: The overlapping items.
+        """
+        found = {}
+        cells = self.cells
+        for cell in self.cell_range(x, y, width, height):
+            for item in cells.get(cell, ()):
+                found[id(item)] = item
+        entries = self.entries
+        overlapping = []
+        for key, item in found.items():
+            _, item_x, item_y, item_width, item_height = entries[key]
+            if item_x <= x + width and x <= item_x + item_width and \
+                    item_y <= y + height and y <= item_y + item_height:
+                overlapping.append(item)
+        return overlapping
+
+    def query_point(self, x, y):
+        """
+        Returns the items whose rectangles contain a point, edges included.
+        Args:
+            x (float): The point's x position.
+            y (float): The point's y position.
+        Returns:
+            list: The items containing the point.
+        """
+        return self.query_rect(x, y, 0, 0)
+
+    def query_circle(self, x, y, radius):
+        """
+        Returns the items whose rectangles overlap a circle.
+        Args:
+            x (float): The centre's x position.
+            y (float): The centre's y position.
+            radius (float): The radius.
+        Returns:
+            list: The overlapping items.
+        """
+        overlapping = []
+        entries = self.entries
+        for item in self.query_rect(x - radius, y - radius, radius * 2, radius * 2):
+            _, item_x, item_y, item_width, item_height = entries[id(item)]
+            # Distance from the centre to the closest point of the rectangle
+            dx = x - min(max(x, item_x), item_x + item_width)
+            dy = y - min(max(y, item_y), item_y + item_height)
+            if dx * dx + dy * dy <= radius * radius:
+                overlapping.append(item)
+        return overlapping
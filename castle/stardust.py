@@ -1,75 +1,125 @@
 # castle/stardust.py
-import random
+from spatial_hash import SpatialHash
+from pool import ObjectPool
+from entity_store import EntityStore
+from pickups import PickupRegistry
+
+STAR_DUST_POOL_SIZE = 256  # Most removed star dust objects kept for reuse
+
+
+class StarDust:
+    __slots__ = ('x', 'y', 'type')
+
+    def __init__(self, x=0.0, y=0.0, type=None):
+        self.set(x, y, type)
+
+    def set(self, x, y, type):
+        self.x = float(x)
+        self.y = float(y)
+        self.type = type
+
 
 class StarDustManager:
     STAR_DUST_SIZE = 30
-    BOOST_DURATION = 10
-    INVINCIBILITY_DURATION = 10
-    DOUBLE_DAMAGE_DURATION = 10
-    RAPID_FIRE_DURATION = 10
     CASTLE_HEALTH = 25
     CASTLE_SIZE = 25
     STAR_DUST_CAP = 100  # Cap for the number of star dust on the playable area at one time
     POWER_UP_CAP = 4  # Cap for the number of power-ups on the playable area at one time
+    SPAWN_RATE = 60  # Star dust created per second while below the cap
 
-    def __init__(self, playable_area_size, castle_size):
-        self.star_dust_list = []
+    def __init__(self, playable_area_size, castle_size, context, pickups=None):
+        self.random = context.random
+        self.pickups = PickupRegistry() if pickups is None else pickups
+        # Type codes of the items the game drops by name, looked up in the pickup file
+        self.health_type = self.pickups.ids['health']
+        self.arrow_stack_type = self.pickups.ids['arrow_stack']
+        self.mushroom_type = self.pickups.ids['mushroom']
+        self.wizard_type = self.pickups.ids['wizard']  # Dropped where extra wizards spawn; never picked up
+        self.star_dust_list = EntityStore()
+        self.grid = SpatialHash(self.STAR_DUST_SIZE)  # Spatial index of star_dust_list
+        self.pool = ObjectPool(StarDust, STAR_DUST_POOL_SIZE)
         self.playable_area_size = playable_area_size
         self.castle_size = castle_size
-        self.arrow1_ratio = 3  # Ensuring ratio of arrow1 to boost is 3:1
-        self.arrow_stack_ratio = 5  # arrow_stack appears at a 1:5 ratio compared to arrow1
-        self.mushroom_ratio = 4  # Mushroom appears at a 1:4 ratio compared to arrow1
         self.total_castles_destroyed = 0
-        self.active_power_ups = []  # Track active power-ups
+        self.power_up_count = 0
+        self.spawn_budget = 0.0  # Star dust owed by the spawn rate but not yet created
+        self.last_spawn_time = None
 
         self.castle_health = self.CASTLE_HEALTH
         self.castle_pos = self.generate_random_position(self.castle_size[0], self.castle_size[1])
 
     def generate_random_position(self, width, height):
         margin = 10
-        x = random.randint(margin, self.playable_area_size - width - margin)
-        y = random.randint(margin, self.playable_area_size - height - margin)
+        x = self.random.randint(margin, self.playable_area_size - width - margin)
+        y = self.random.randint(margin, self.playable_area_size - height - margin)
         return [x, y]
     
     def create_star_dust(self, position=None, health=False, type=None):
-        if type:
+        if type is not None:
             star_dust_type = type
         elif health:
-            star_dust_type = 'health'
-        elif random.randint(1, self.arrow_stack_ratio + 1) == 1:
-            star_dust_type = 'arrow_stack'
-        elif random.randint(1, self.mushroom_ratio + 1) == 1:
-            star_dust_type = 'mushroom'
-        elif random.randint(1, self.arrow1_ratio + 1) == 1:
-            star_dust_type = 'boost'
+            star_dust_type = self.health_type
         else:
-            star_dust_type = 'arrow1'
+            star_dust_type = self.pickups.random_item(self.random)
 
         if not position:
             position = self.generate_random_position(self.STAR_DUST_SIZE, self.STAR_DUST_SIZE)
         
-        return {'pos': position, 'type': star_dust_type}
-
-    def spawn_star_dust(self):
-        if len(self.star_dust_list) < self.STAR_DUST_CAP:
-            power_up_types = ['invincibility', 'double_damage', 'rapid_fire']
-            active_power_up_count = sum(1 for sd in self.star_dust_list if sd['type'] in power_up_types)
-            if active_power_up_count < self.POWER_UP_CAP:
-                power_up_type = random.choice(power_up_types)
-                power_up = self.create_star_dust(type=power_up_type)
-                self.star_dust_list.append(power_up)
-                self.active_power_ups.append(power_up)
+        star_dust = self.pool.acquire()
+        star_dust.set(position[0], position[1], star_dust_type)
+        return star_dust
+
+    def add_star_dust(self, star_dust):
+        self.star_dust_list.add(star_dust)
+        if self.pickups.types[star_dust.type].power_up:
+            self.power_up_count += 1
+        self.grid.insert(star_dust, star_dust.x, star_dust.y, self.STAR_DUST_SIZE, self.STAR_DUST_SIZE)
+
+    def remove_star_dust(self, star_dust):
+        self.star_dust_list.remove(star_dust)
+        self.grid.remove(star_dust)
+        if self.pickups.types[star_dust.type].power_up:
+            self.power_up_count -= 1
+        self.pool.release(star_dust)
+
+    def reset_star_dust(self, count):
+        for star_dust in self.star_dust_list:
+            self.pool.release(star_dust)
+        self.star_dust_list.clear()
+        self.grid.clear()
+        self.power_up_count = 0
+        for _ in range(count):
+            self.add_star_dust(self.create_star_dust())
+
+    def star_dust_near(self, position, radius):
+        # Star dust whose square overlaps the circle
+        return self.grid.query_circle(position[0], position[1], radius)
+
+    def star_dust_in_rect(self, x, y, width, height):
+        return self.grid.query_rect(x, y, width, height)
+
+    def spawn_star_dust(self, now):
+        # Spawning follows SPAWN_RATE whatever the frame rate; nothing is owed while at the cap
+        if self.last_spawn_time is None:
+            self.last_spawn_time = now
+        self.spawn_budget += (now - self.last_spawn_time) * self.SPAWN_RATE / 1000
+        self.last_spawn_time = now
+        missing = self.STAR_DUST_CAP - len(self.star_dust_list)
+        if missing <= 0:
+            self.spawn_budget = 0.0
+            return
+        count = min(int(self.spawn_budget), missing)
+        self.spawn_budget -= count
+        for _ in range(count):
+            if self.power_up_count < self.POWER_UP_CAP:
+                self.add_star_dust(self.create_star_dust(type=self.pickups.random_power_up(self.random)))
             else:
-                self.star_dust_list.append(self.create_star_dust())
+                self.add_star_dust(self.create_star_dust())
 
     def check_laser_collision(self, position):
-        for star_dust in self.star_dust_list[:]:
-            if star_dust['pos'][0] <= position[0] <= star_dust['pos'][0] + self.STAR_DUST_SIZE and \
-               star_dust['pos'][1] <= position[1] <= star_dust['pos'][1] + self.STAR_DUST_SIZE:
-                self.star_dust_list.remove(star_dust)
-                if star_dust in self.active_power_ups:
-                    self.active_power_ups.remove(star_dust)
-                return True
+        for star_dust in self.grid.query_point(position[0], position[1]):
+            self.remove_star_dust(star_dust)
+            return True
         return False
 
     def reset_castle(self):
@@ -0,0 +1,77 @@
+# castle/text.py
+from collections import OrderedDict
+
+import pygame
+
+# Number of rendered strings kept before the least recently used is dropped
+TEXT_CACHE_SIZE = 128
+
+
+class TextRenderer:
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        """
+        Initializes the TextRenderer.
+
+        Fonts are loaded once and rendered strings are cached, so text that does
+        not change between frames is never rasterized again.
+        Args:
+            max_entries (int): The number of rendered strings to keep.
+        """
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def font(self, size, name=None):
+        """
+        Returns a font, loading it on first use.
+        Args:
+            size (int): The font size.
+            name (str): The font file, or None for the default font.
+        Returns:
+            pygame.font.Font: The font.
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, colour, antialias=True, name=None):
+        """
+        Returns the rendered text, rasterizing it only on a cache miss.
+        Args:
+            text (str): The text to render.
+            size (int): The font size.
+            colour (tuple): The text colour.
+            antialias (bool): Whether to antialias the text.
+            name (str): The font file, or None for the default font.
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (name, size, text, tuple(colour), antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font(size, name).render(text, antialias, colour)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def render_tinted(self, text, size, colour, name=None):
+        """
+        Returns the text in a colour that changes often, such as a pulsing label.
+        The white glyphs are rendered once and the colour is multiplied into a copy.
+        Args:
+            text (str): The text to render.
+            size (int): The font size.
+            colour (tuple): The text colour.
+            name (str): The font file, or None for the default font.
+        Returns:
+            pygame.Surface: The tinted text.
+        """
+        tinted = self.render(text, size, (255, 255, 255), name=name).copy()
+        tinted.fill([int(channel) for channel in colour], special_flags=pygame.BLEND_RGB_MULT)
+        return tinted
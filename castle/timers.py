@@ -0,0 +1,73 @@
+# castle/timers.py
+import heapq
+import itertools
+import pygame
+
+
+class TimerService:
+    def __init__(self, clock=pygame.time.get_ticks):
+        """
+        Initializes the TimerService.
+
+        Timers wait in a heap ordered by deadline, so each update only touches the
+        timers that are due instead of every timer being polled every frame.
+        Args:
+            clock (callable): Returns the current time in milliseconds.
+        """
+        self.clock = clock
+        self.queue = []
+        self.sequence = itertools.count()  # Keeps timers with equal deadlines in scheduling order
+
+    def __len__(self):
+        return len(self.queue)
+
+    def now(self):
+        """
+        Returns the current time in milliseconds.
+        """
+        return self.clock()
+
+    def schedule_at(self, deadline, callback):
+        """
+        Calls a function once the clock reaches a deadline.
+        Args:
+            deadline (int): The time to call it at, in milliseconds.
+            callback (callable): The function to call, with no arguments.
+        Returns:
+            list: The timer, for cancel.
+        """
+        timer = [deadline, next(self.sequence), callback]
+        heapq.heappush(self.queue, timer)
+        return timer
+
+    def schedule(self, delay, callback):
+        """
+        Calls a function after a delay.
+        Args:
+            delay (int): The delay in milliseconds.
+            callback (callable): The function to call, with no arguments.
+        Returns:
+            list: The timer, for cancel.
+        """
+        return self.schedule_at(self.now() + delay, callback)
+
+    @staticmethod
+    def cancel(timer):
+        """
+        Stops a timer from firing. It is dropped from the heap when its deadline comes.
+        Args:
+            timer (list): A timer returned by schedule or schedule_at, or None.
+        """
+        if timer is not None:
+            timer[2] = None
+
+    def update(self):
+        """
+        Calls every timer that is due, earliest first.
+        """
+        now = self.now()
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            callback = heapq.heappop(queue)[2]
+            if callback is not None:
+                callback()
@@ -1,8 +1,7 @@
 # castle/utils.py
-import pygame
-import random
 from stardust import StarDustManager
 from castle import Castle  # Import the Castle class
+from projectiles import PLAYER_LASER
 
 def calculate_exp_needed(level):
     """
@@ -40,15 +39,15 @@ def reset_game(player, stardust_manager):
     """
     # Reset player properties
     player.speed = 5
-    player.boost_end_time = 10
+    player.end_boost()
     player.collected_star_dust = 0
     player.position = [player.playable_area_size // 2, player.playable_area_size // 2]
-    player.lasers = []
+    player.projectiles.clear(kind=PLAYER_LASER)
     player.last_direction = (1, 0)
     player.current_level = 1
     player.current_experience = 0
     player.health = player.max_health
-    player.last_spawn_time = pygame.time.get_ticks()   
+    player.last_spawn_time = player.timers.now()
 
     # Reset stardust
-    stardust_manager.star_dust_list = [stardust_manager.create_star_dust() for _ in range(40)]
\ No newline at end of file
+    stardust_manager.reset_star_dust(40)
\ No newline at end of file
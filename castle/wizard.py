@@ -1,19 +1,32 @@
 # castle/wizard.py
 import pygame
 import math
-import random
+from projectiles import WIZARD_ORB
 
 class Wizard:
-    def __init__(wizard, playable_area_size, player, stardust_manager):
+    ORB_DAMAGE = 5
+    MIN_PLAYER_DISTANCE = 100  # Wizards stop moving once this close to the player
+
+    def __init__(wizard, wizard_id, playable_area_size, player, stardust_manager, assets, rotation_cache, projectiles,
+                 timers, context):
         """
         Initializes the wizard.
         Args:
+            wizard_id (int): The id that marks the wizard's orbs.
             playable_area_size (int): The size of the playable area.
             player (Player): The player object.
             stardust_manager (StarDustManager): The stardust manager object.
-        """
-        wizard.image = pygame.image.load('pics/wizard.png').convert_alpha()
+            assets (AssetManager): The loaded game images.
+            rotation_cache (RotationCache): The shared cache of rotated sprites.
+            projectiles (ProjectileBuffer): The buffer the wizard's orbs live in.
+            timers (TimerService): The timers that pace the wizard's shots.
+            context (GameContext): The source of random numbers.
+        """
+        wizard.id = wizard_id
+        wizard.random = context.random
+        wizard.image = assets.image('wizard')
         wizard.original_image = wizard.image
+        wizard.rotation_cache = rotation_cache
         wizard.size = player.size  # Set the wizard's size to be the same as the player's size
 
         wizard.playable_area_size = playable_area_size
@@ -22,22 +35,26 @@ class Wizard:
         
         # Initialize wizard properties
         wizard.position = wizard.generate_random_position()
+        wizard.previous_position = tuple(wizard.position)  # Position before the last tick, for drawing between ticks
         wizard.speed = 2
         wizard.health = 25
         wizard.max_health = 25
-        wizard.orbs = []
-        wizard.orb_image = pygame.image.load('pics/orb.png').convert_alpha()  # Ensure alpha is handled
+        wizard.projectiles = projectiles
+        wizard.orb_image = assets.image('orb')
         wizard.orb_speed = 3
-        wizard.last_shot_time = pygame.time.get_ticks()
+        wizard.timers = timers
         wizard.shot_interval = 4000  # Time between shots in milliseconds; slowed down from 2000 to 4000
+        wizard.shot_timer = timers.schedule(wizard.shot_interval, wizard.shoot_orb)
+        wizard.heading = (0.0, 0.0)  # Normalized direction to the player when it last thought
+        wizard.think()
 
     def generate_random_position(wizard):
         """
         Generates a random position for the wizard, respecting the playable area.
         """
         margin = 10
-        x = random.randint(margin, wizard.playable_area_size - wizard.size * 2 - margin)
-        y = random.randint(margin, wizard.playable_area_size - wizard.size * 2 - margin)
+        x = wizard.random.randint(margin, wizard.playable_area_size - wizard.size * 2 - margin)
+        y = wizard.random.randint(margin, wizard.playable_area_size - wizard.size * 2 - margin)
         return [x, y]
 
     def spawn_wizard(wizard):
@@ -45,7 +62,7 @@ class Wizard:
         Spawns additional wizards based on the player's current level.
         """
         for _ in range(wizard.player.current_level):
-            wizard.stardust_manager.star_dust_list.append(wizard.stardust_manager.create_star_dust(position=wizard.generate_random_position(), type='wizard'))
+            wizard.stardust_manager.add_star_dust(wizard.stardust_manager.create_star_dust(position=wizard.generate_random_position(), type=wizard.stardust_manager.wizard_type))
 
     def check_player_level(wizard):
         """
@@ -59,30 +76,40 @@ class Wizard:
         Respawns the wizard at a new position and regenerates its health.
         """
         wizard.position = wizard.generate_random_position()
+        wizard.previous_position = tuple(wizard.position)
         wizard.health = wizard.max_health
-        wizard.last_shot_time = pygame.time.get_ticks() + 5000
+        wizard.think()
+        wizard.timers.cancel(wizard.shot_timer)
+        wizard.shot_timer = wizard.timers.schedule(5000 + wizard.shot_interval, wizard.shoot_orb)
         wizard.check_player_level()
         wizard.spawn_wizard()
 
     def move_towards_player(wizard, castle_pos, castle_size):
         """
-        Moves the wizard towards the player.
+        Moves the wizard along its heading, unless it is already close to the player.
         Args:
             castle_pos (tuple): The position of the castle.
             castle_size (tuple): The size of the castle.
         """
-        direction_vector = (wizard.player.position[0] - wizard.position[0], wizard.player.position[1] - wizard.position[1])
-        distance = math.sqrt(direction_vector[0]**2 + direction_vector[1]**2)
-
-        # Maintain a minimum distance of 30 pixels from the player
-        if distance > 100:
-            normalized_direction = (direction_vector[0] / distance, direction_vector[1] / distance)
-            new_pos_x = wizard.position[0] + normalized_direction[0] * wizard.speed
-            new_pos_y = wizard.position[1] + normalized_direction[1] * wizard.speed
+        dx = wizard.player.position[0] - wizard.position[0]
+        dy = wizard.player.position[1] - wizard.position[1]
+        # Squared distances, so the check stays exact between retargets without a sqrt every tick
+        if dx * dx + dy * dy > wizard.MIN_PLAYER_DISTANCE * wizard.MIN_PLAYER_DISTANCE:
+            new_pos_x = wizard.position[0] + wizard.heading[0] * wizard.speed
+            new_pos_y = wizard.position[1] + wizard.heading[1] * wizard.speed
             if not wizard.collides_with_castle(new_pos_x, new_pos_y, castle_pos, castle_size):
                 wizard.position[0] = new_pos_x
                 wizard.position[1] = new_pos_y
 
+    def retarget(wizard):
+        """
+        Points the wizard's heading at the player.
+        """
+        direction_vector = (wizard.player.position[0] - wizard.position[0], wizard.player.position[1] - wizard.position[1])
+        distance = math.sqrt(direction_vector[0]**2 + direction_vector[1]**2)
+        if distance != 0:
+            wizard.heading = (direction_vector[0] / distance, direction_vector[1] / distance)
+
     def angle_to_player(wizard):
         """
         Calculates the angle to the player.
@@ -92,56 +119,43 @@ class Wizard:
 
     def shoot_orb(wizard):
         """
-        Shoots an orb towards the player if the shot interval has passed.
+        Shoots an orb towards the player. Called by the wizard's shot timer, which it then restarts.
+        """
+        direction_vector = (wizard.player.position[0] - wizard.position[0], wizard.player.position[1] - wizard.position[1])
+        distance = math.sqrt(direction_vector[0]**2 + direction_vector[1]**2)
+        if distance != 0:
+            normalized_direction = (direction_vector[0] / distance, direction_vector[1] / distance)
+            wizard.projectiles.spawn(WIZARD_ORB, wizard.id, wizard.position[0], wizard.position[1], normalized_direction,
+                                     wizard.orb_speed, wizard.ORB_DAMAGE,
+                                     wizard.orb_image.get_width(), wizard.orb_image.get_height())
+            wizard.shot_timer = wizard.timers.schedule(wizard.shot_interval, wizard.shoot_orb)
+        else:
+            # Standing on the player; try again on the next update
+            wizard.shot_timer = wizard.timers.schedule(1, wizard.shoot_orb)
+
+    def stop(wizard):
+        """
+        Cancels the wizard's pending shot, once it is removed from the game.
         """
-        now = pygame.time.get_ticks()
-        if now - wizard.last_shot_time >= wizard.shot_interval:
-            direction_vector = (wizard.player.position[0] - wizard.position[0], wizard.player.position[1] - wizard.position[1])
-            distance = math.sqrt(direction_vector[0]**2 + direction_vector[1]**2)
-            if distance != 0:
-                normalized_direction = (direction_vector[0] / distance, direction_vector[1] / distance)
-                wizard.orbs.append({'pos': list(wizard.position), 'dir': normalized_direction})
-                wizard.last_shot_time = now
+        wizard.timers.cancel(wizard.shot_timer)
 
     def update(wizard, castle_pos, castle_size):
         """
-        Updates the wizard's position and action.
+        Moves the wizard; runs every tick.
         Args:
             castle_pos (tuple): The position of the castle.
             castle_size (tuple): The size of the castle.
         """
         wizard.move_towards_player(castle_pos, castle_size)
-        wizard.shoot_orb()
-
-        # Rotate the wizard to face the player
-        angle = wizard.angle_to_player()
-        wizard.image = pygame.transform.rotate(wizard.original_image, angle)
 
-    def draw(wizard, screen, offset_x, offset_y):
+    def think(wizard):
         """
-        Draws the wizard and its orbs.
-        Args:
-            screen (pygame.Surface): The screen to draw on.
-            offset_x (int): The x offset for drawing.
-            offset_y (int): The y offset for drawing.
+        Retargets the wizard and rotates it to face the player. Runs when the
+        AIScheduler gives the wizard its turn, not every tick.
         """
-        wizard_rect = wizard.image.get_rect(center=(wizard.position[0] - offset_x, wizard.position[1] - offset_y))
-        screen.blit(wizard.image, wizard_rect.topleft)
-
-        # Draw wizard health bar
-        health_bar_length = wizard.size * 2
-        health_ratio = wizard.health / wizard.max_health
-        health_bar_width = health_ratio * health_bar_length
-        health_bar_x = wizard.position[0] - offset_x - wizard.size
-        health_bar_y = wizard.position[1] - offset_y + wizard.size + 10
-
-        pygame.draw.rect(screen, (255, 0, 0), (health_bar_x, health_bar_y, health_bar_length, 5))
-        pygame.draw.rect(screen, (0, 255, 0), (health_bar_x, health_bar_y, health_bar_width, 5))
-
-        for orb in wizard.orbs:
-            orb['pos'][0] += orb['dir'][0] * wizard.orb_speed
-            orb['pos'][1] += orb['dir'][1] * wizard.orb_speed
-            screen.blit(wizard.orb_image, (orb['pos'][0] - offset_x, orb['pos'][1] - offset_y))
+        wizard.retarget()
+        angle = wizard.angle_to_player()
+        wizard.image = wizard.rotation_cache.rotate(wizard.original_image, angle)
 
     def take_damage(wizard, amount):
         """
@@ -151,7 +165,7 @@ class Wizard:
         """
         wizard.health = max(wizard.health - amount, 0)
         if wizard.health <= 0:
-            wizard.stardust_manager.star_dust_list.append(wizard.stardust_manager.create_star_dust(position=wizard.position, type='mushroom'))
+            wizard.stardust_manager.add_star_dust(wizard.stardust_manager.create_star_dust(position=list(wizard.position), type=wizard.stardust_manager.mushroom_type))
 
     def collides_with_castle(wizard, x, y, castle_pos, castle_size):
         """
@@ -1,37 +1,58 @@
 # castle/wizard_manager.py
-import pygame
-import random
 from wizard import Wizard
+from projectiles import WIZARD_ORB
+from entity_store import EntityStore
+from ai_scheduler import AIScheduler
 
 class WizardManager:
-    def __init__(self, playable_area_size, player, stardust_manager):
+    def __init__(self, playable_area_size, player, stardust_manager, assets, rotation_cache, projectiles, timers, context):
         self.playable_area_size = playable_area_size
+        self.assets = assets
+        self.rotation_cache = rotation_cache
+        self.projectiles = projectiles
+        self.timers = timers
+        self.context = context
+        self.next_wizard_id = 1
         self.player = player
         self.stardust_manager = stardust_manager
-        self.wizards = []
-        self.last_spawn_time = 0
+        self.wizards = EntityStore()
+        self.ai_scheduler = AIScheduler()  # Spreads retargeting and sprite rotation across ticks
         self.respawn_delay = 5000  # 5 seconds
+        self.spawn_ready = False  # Set by the spawn timer once respawn_delay has passed
+        self.spawn_timer = None
 
     def update(self, castle_pos, castle_size):
-        now = pygame.time.get_ticks()
         # Maintain the number of wizards according to the player's level
-        if len(self.wizards) < self.player.current_level and now - self.last_spawn_time >= self.respawn_delay:
-            self.wizards.append(Wizard(self.playable_area_size, self.player, self.stardust_manager))
-            self.last_spawn_time = now
+        if self.spawn_ready and len(self.wizards) < self.player.current_level:
+            self.wizards.add(Wizard(self.next_wizard_id, self.playable_area_size, self.player, self.stardust_manager,
+                                    self.assets, self.rotation_cache, self.projectiles, self.timers,
+                                    self.context))
+            self.next_wizard_id += 1
+            self.schedule_spawn()
         
         # Update each wizard
         for wizard in self.wizards:
+            wizard.previous_position = tuple(wizard.position)
             wizard.update(castle_pos, castle_size)
-
-    def draw(self, screen, offset_x, offset_y):
-        for wizard in self.wizards:
-            wizard.draw(screen, offset_x, offset_y)
+        self.ai_scheduler.run(self.wizards)
 
     def handle_collisions(self, player):
-        for wizard in self.wizards[:]:
-            if wizard.health <= 0:
-                self.wizards.remove(wizard)
+        for wizard in self.wizards.remove_if(lambda wizard: wizard.health <= 0):
+            wizard.stop()
+            # A wizard's orbs vanish with it
+            self.projectiles.clear(kind=WIZARD_ORB, owner=wizard.id)
 
     def reset(self):
-        self.wizards = []
-        self.last_spawn_time = pygame.time.get_ticks()
\ No newline at end of file
+        for wizard in self.wizards:
+            wizard.stop()
+        self.wizards.clear()
+        self.projectiles.clear(kind=WIZARD_ORB)
+        self.schedule_spawn()
+
+    def schedule_spawn(self):
+        self.spawn_ready = False
+        self.timers.cancel(self.spawn_timer)
+        self.spawn_timer = self.timers.schedule(self.respawn_delay, self.allow_spawn)
+
+    def allow_spawn(self):
+        self.spawn_ready = True
\ No newline at end of file